@@ -1,12 +1,7 @@
 import streamlit as st
-import pandas as pd
 import hashlib
-from pathlib import Path
-from hockey_stats.sheets_service import get_games_data, get_events_data, get_players_data, get_game_roster_data, calculate_game_results
 from hockey_stats.utils import load_css, load_js, local_image
-from hockey_stats.components.player_stats import player_stats_view
-from hockey_stats.components.team_stats import team_stats_view
-from hockey_stats.components.game_stats import game_stats_view
+from hockey_stats.metrics import RERUNS, export_from_env
 
 # Page configuration
 st.set_page_config(
@@ -100,6 +95,26 @@ def check_password():
 if not check_password():
     st.stop()
 
+# The data layer pulls in pandas, gspread and the Google auth libraries, so it
+# is imported only once the user is logged in to keep the login page fast
+import pandas as pd
+
+# Cached frames are handed to every session as shallow views (see hockey_stats.shared);
+# with copy-on-write a view copies whatever it writes to, so the cached frame never changes
+pd.set_option("mode.copy_on_write", True)
+
+from hockey_stats.sheets_service import get_games_data, get_events_data, get_players_data, get_game_roster_data, get_game_results
+from hockey_stats.archive import CURRENT_SEASON, archive_version, archived_seasons, get_archived_table
+from hockey_stats.dates import get_game_index, played_game_ids
+from hockey_stats.windows import WINDOW_OPTIONS, apply_window, window_game_ids
+from hockey_stats.components.player_stats import player_stats_view
+from hockey_stats.components.team_stats import team_stats_view
+from hockey_stats.components.game_stats import game_stats_view
+from hockey_stats.components.player_comparison import player_comparison_view
+
+# Serve or write operational metrics when HOCKEY_STATS_METRICS_PORT or HOCKEY_STATS_METRICS_FILE is set
+export_from_env()
+
 # Main application (only runs if authenticated)
 # Use both native Streamlit heading and a custom div for Android compatibility
 # Using CSS classes instead of inline styles
@@ -109,7 +124,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Navigation options
-nav_options = ["My Player's Stats", "Team Stats & Leaderboards", "Game Stats"]
+nav_options = ["My Player's Stats", "Team Stats & Leaderboards", "Game Stats", "Compare Players"]
 
 # Default to Team Stats & Leaderboards
 if 'nav_selection' not in st.session_state:
@@ -120,7 +135,7 @@ nav_container = st.container()
 
 # Create a row of buttons for navigation
 with nav_container:
-    cols = st.columns(3)
+    cols = st.columns(len(nav_options))
     
     # Style each button as a box
     for i, option in enumerate(nav_options):
@@ -132,8 +147,14 @@ with nav_container:
             st.session_state.nav_selection = option
             st.rerun()
 
-# Add logout button at the top right
+# Add logout button at the top right, with the season picker beside it once seasons are archived
 logout_col1, logout_col2 = st.columns([4, 1])
+archived = archived_seasons()
+# Read once per rerun and passed to every archive cache, so a season frozen meanwhile shows up on the next rerun
+archive_key = archive_version() if archived else None
+season_options = [CURRENT_SEASON] + archived[::-1]
+with logout_col1:
+    selected_season = st.selectbox("Season", season_options, key="season") if len(season_options) > 1 else CURRENT_SEASON
 with logout_col2:
     if st.button("Logout", key="logout_button", type="primary", use_container_width=True):
         st.session_state["authenticated"] = False
@@ -144,21 +165,72 @@ st.markdown("<hr>", unsafe_allow_html=True)
 
 # Load data
 with st.spinner("Loading data..."):
-    games_df = get_games_data()
-    events_df = get_events_data()
-    players_df = get_players_data()
-    game_roster_df = get_game_roster_data()
+    if selected_season == CURRENT_SEASON:
+        games_df = get_games_data()
+        events_df = get_events_data()
+        players_df = get_players_data()
+        game_roster_df = get_game_roster_data()
+    else:
+        # Past seasons come from the archive, read only for the selected season
+        games_df = get_archived_table('Games', selected_season, archive_key)
+        events_df = get_archived_table('Events', selected_season, archive_key)
+        players_df = get_archived_table('Players', selected_season, archive_key)
+        game_roster_df = get_archived_table('GameRoster', selected_season, archive_key)
+    
+    # Rows quarantined by the load-time normalization, by sheet and reason
+    rejected_rows = {
+        sheet: df.attrs.get('rejected', {})
+        for sheet, df in [('Games', games_df), ('Events', events_df), ('Players', players_df), ('GameRoster', game_roster_df)]
+        if df.attrs.get('rejected')
+    }
     
     # Calculate game results from events data
     if not games_df.empty and not events_df.empty:
-        games_df = calculate_game_results(games_df, events_df)
+        games_df = get_game_results(games_df, events_df)
     
+# Restrict every view to a window of games, e.g. the last 5 or since a tournament
+game_index_df = get_game_index(games_df)
+window_col1, window_col2 = st.columns([1, 2])
+with window_col1:
+    selected_window = st.selectbox("Games", WINDOW_OPTIONS, key="game_window")
+date_range = None
+dated_games = game_index_df.index.dropna()
+if selected_window == "Date range" and len(dated_games):
+    with window_col2:
+        picked = st.date_input(
+            "Dates",
+            value=(dated_games.min().date(), dated_games.max().date()),
+            min_value=dated_games.min().date(),
+            max_value=dated_games.max().date(),
+            key="game_window_dates"
+        )
+    # The picker holds a single date while the end of the range is being chosen
+    date_range = (list(picked) + [None, None])[:2]
+played_ids = played_game_ids(games_df, events_df)
+window_ids = window_game_ids(game_index_df, selected_window, date_range, played_ids)
+if window_ids is not None:
+    games_df, events_df, game_roster_df = apply_window(window_ids, games_df, events_df, game_roster_df)
+    with window_col1:
+        st.caption(f"Showing {len(window_ids)} of {len(played_ids)} games played")
+
+# Let coaches know when rows were skipped so they can fix the sheet
+if rejected_rows:
+    with st.expander("Data quality"):
+        for sheet, reasons in rejected_rows.items():
+            for reason, count in reasons.items():
+                st.caption(f"{sheet}: skipped {count} row(s) with {reason}")
+
 # Display selected view
+RERUNS.inc(view=st.session_state.nav_selection)
+
 if st.session_state.nav_selection == "My Player's Stats":
-    player_stats_view(players_df, games_df, events_df, game_roster_df)
+    player_stats_view(players_df, games_df, events_df, game_roster_df, archive_key)
 
 elif st.session_state.nav_selection == "Team Stats & Leaderboards":
     team_stats_view(players_df, games_df, events_df, game_roster_df)
 
 elif st.session_state.nav_selection == "Game Stats":
     game_stats_view(players_df, games_df, events_df, game_roster_df)
+
+elif st.session_state.nav_selection == "Compare Players":
+    player_comparison_view(players_df, games_df, events_df, game_roster_df)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Measure cold import time for the login page and for the data layer.
+Each sample runs in a fresh interpreter, like a cold container start.
+
+Usage: python benchmark_imports.py [--runs 5] [--top 10]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# What app.py imports before the login gate, and what it imports after it
+STAGES = {
+    "login page": ["streamlit", "hockey_stats.utils"],
+    "data layer": [
+        "hockey_stats.sheets_service",
+        "hockey_stats.components.player_stats",
+        "hockey_stats.components.team_stats",
+        "hockey_stats.components.game_stats",
+    ],
+}
+
+# Libraries that should not be loaded before the user logs in
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "gspread", "google.oauth2", "requests"]
+
+PROBE = """
+import importlib, json, sys, time
+stages = json.loads(sys.argv[1])
+result = {}
+for stage, modules in stages.items():
+    start = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    result[stage] = {
+        "seconds": time.perf_counter() - start,
+        "heavy": [m for m in json.loads(sys.argv[2]) if m in sys.modules],
+    }
+print(json.dumps(result))
+"""
+
+def sample():
+    """Import times of each stage, in order, in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(STAGES), json.dumps(HEAVY_MODULES)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+def slowest_imports(modules, top):
+    """The `top` libraries the given modules pull in, by cumulative import time, from -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)],
+        capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Names are indented two spaces per nesting level; keep direct imports of the listed modules
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = [sample() for _ in range(args.runs)]
+    for stage in STAGES:
+        seconds = [s[stage]["seconds"] for s in samples]
+        print(f"{stage:<12} median {statistics.median(seconds) * 1000:7.1f} ms  "
+              f"(min {min(seconds) * 1000:.1f}, max {max(seconds) * 1000:.1f}, {args.runs} runs)")
+
+    heavy = samples[0]["login page"]["heavy"]
+    print(f"\nHeavy modules loaded before login: {', '.join(heavy) if heavy else 'none'}")
+
+    all_modules = [module for modules in STAGES.values() for module in modules]
+    print("\nSlowest libraries imported by the app:")
+    for microseconds, name in slowest_imports(all_modules, args.top):
+        print(f"  {microseconds / 1000:7.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
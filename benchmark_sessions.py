@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Measure per-rerun CPU time and peak memory with many open sessions.
+Runs the app against synthetic offline data, so no secrets or network are needed.
+AppTest sessions cannot run on parallel threads, so their reruns are interleaved
+round-robin while all sessions stay open in one server process.
+
+Usage: python benchmark_sessions.py [--sessions 20] [--reruns 3] [--games 100]
+"""
+
+import argparse
+import resource
+import time
+
+from streamlit.testing.v1 import AppTest
+
+import hockey_stats.sheets_service as sheets_service
+from hockey_stats.offline import FakeSheetsClient, generate_records
+
+VIEWS = ["My Player's Stats", "Team Stats & Leaderboards", "Game Stats"]
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def new_session(view):
+    at = AppTest.from_file("app.py", default_timeout=300)
+    at.secrets["TEAM_PASSWORD_HASH"] = ""
+    at.session_state["authenticated"] = True
+    at.session_state["nav_selection"] = view
+    return at
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--players", type=int, default=40)
+    args = parser.parse_args()
+
+    records = generate_records(n_players=args.players, n_games=args.games)
+    sheets_service.connect_to_sheets = lambda: FakeSheetsClient(records)
+
+    # Warm the caches with one session so the measurement covers steady-state reruns
+    warmup = new_session(VIEWS[1])
+    warmup.run()
+    baseline_rss = peak_rss_mb()
+
+    sessions = [new_session(VIEWS[i % len(VIEWS)]) for i in range(args.sessions)]
+    errors = []
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(args.reruns):
+        for at in sessions:
+            at.run()
+            if at.exception:
+                errors.append(at.exception[0].value)
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    reruns = args.sessions * args.reruns
+    print(f"Events rows:       {len(records['Events'])}")
+    print(f"Sessions x reruns: {args.sessions} x {args.reruns}")
+    print(f"CPU per rerun:     {cpu / reruns * 1000:.1f} ms")
+    print(f"Wall time:         {wall:.1f} s")
+    print(f"Peak RSS:          {peak_rss_mb():.0f} MB (after warm-up: {baseline_rss:.0f} MB)")
+    if errors:
+        print(f"Errors:            {len(errors)} (first: {errors[0]})")
+
+if __name__ == "__main__":
+    main()
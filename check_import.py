@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Check that importing the same score sheet twice writes its rows only once.
+Runs the importer against an in-memory copy of synthetic sheets: a Games file
+without an ID column, an Events file and a GameRoster file are each imported
+twice, then the sheets are reloaded the way the app loads them to make sure
+the new games keep their IDs and nothing was written twice.
+
+Usage: python check_import.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from hockey_stats.importer import import_file, read_sheet_rows
+from hockey_stats.offline import generate_records, save_records
+from hockey_stats.sheets_service import OFFLINE_RECORDS_ENV
+
+NEW_GAMES = pd.DataFrame({
+    'Date': ['2025-03-01', '2025-03-08'],
+    'Opponent': ['Hawks', 'Lions'],
+    'Location': ['Home', 'Away'],
+})
+NEW_GAME_IDS = ['2025-03-01_hawks', '2025-03-08_lions']
+
+def write_files(directory):
+    """Games without IDs, plus events and a roster for the first of them"""
+    games_path = Path(directory) / 'games.csv'
+    NEW_GAMES.to_csv(games_path, index=False)
+
+    events_path = Path(directory) / 'events.csv'
+    pd.DataFrame({
+        'GameID': [NEW_GAME_IDS[0]] * 3,
+        'EventType': ['Goal', 'Shot', 'Penalty'],
+        'Period': [1, 2, 3],
+        'Time': ['4:10', '8:45', '12:00'],
+        'PrimaryPlayerID': ['player_5', 'player_6', 'player_7'],
+        'Team': ['your_team'] * 3,
+        'IsGoal': ['Yes', '', ''],
+        'PenaltyDuration': [0, 0, 2],
+        'YourTeamPlayersOnIce': ['player_5, player_1', '', ''],
+    }).to_csv(events_path, index=False)
+
+    roster_path = Path(directory) / 'roster.csv'
+    pd.DataFrame({
+        'GameID': [NEW_GAME_IDS[0]] * 2,
+        'PlayerID': ['player_1', 'player_5'],
+        'Status': ['Present', 'Present'],
+    }).to_csv(roster_path, index=False)
+
+    return [(games_path, 'Games'), (events_path, 'Events'), (roster_path, 'GameRoster')]
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        records_path = Path(directory) / 'records.json'
+        save_records(generate_records(n_games=5), records_path)
+        os.environ[OFFLINE_RECORDS_ENV] = str(records_path)
+
+        for path, sheet_name in write_files(directory):
+            before = len(read_sheet_rows(sheet_name))
+            first = import_file(path, sheet_name)
+            second = import_file(path, sheet_name)
+            after = len(read_sheet_rows(sheet_name))
+            print(f"{sheet_name}: first import wrote {first['written']}, second wrote {second['written']}, "
+                  f"skipped {second['duplicates']}; sheet has {after - before} new rows")
+            if second['written'] or after - before != first['written'] or not first['written']:
+                failures.append(f"{sheet_name} rows were not written exactly once")
+
+        games_df = read_sheet_rows('Games')
+        missing = [game_id for game_id in NEW_GAME_IDS if game_id not in set(games_df['GameID'])]
+        if missing:
+            failures.append(f"imported games lost their IDs on reload: {', '.join(missing)}")
+        if games_df.attrs.get('rejected'):
+            failures.append(f"reloaded games were quarantined: {games_df.attrs['rejected']}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Check the Sheets request scheduler against the fake client that injects errors.
+Covers retries of rate-limited reads, waiting out Retry-After, giving up on
+errors that are not worth retrying or after the last retry, and coalescing
+concurrent reads of the same worksheet into one fetch (single-flight).
+Backoff sleeps are recorded instead of slept, except in the concurrent check.
+
+Usage: python check_scheduler.py
+"""
+
+import sys
+import threading
+
+from hockey_stats.offline import FakeSheetsClient, generate_records
+from hockey_stats.scheduler import SheetsScheduler
+
+RECORDS = generate_records(n_players=4, n_games=2)
+
+class Sleeps:
+    """Stand-in for time.sleep that records the delays asked for"""
+
+    def __init__(self):
+        self.delays = []
+
+    def __call__(self, seconds):
+        self.delays.append(seconds)
+
+def fetcher(client, worksheet='Events'):
+    return lambda: client.open_by_key('key').worksheet(worksheet).get_all_records()
+
+def check_retries():
+    client = FakeSheetsClient(RECORDS, failures={'Events': 2})
+    sleeps = Sleeps()
+    scheduler = SheetsScheduler(sleep=sleeps, jitter=lambda: 1.0)
+    records = scheduler.run('Events', fetcher(client))
+    return [
+        (len(records) == len(RECORDS['Events']), "rate-limited read returns the records once it succeeds"),
+        (client.calls['Events'] == 3, f"two 429s then a success make 3 calls (made {client.calls['Events']})"),
+        (sleeps.delays == [1.0, 2.0], f"backoff doubles between attempts (slept {sleeps.delays})"),
+        (scheduler.stats['retries'] == 2 and scheduler.stats['failures'] == 0, f"stats count 2 retries ({scheduler.stats})"),
+    ]
+
+def check_retry_after():
+    client = FakeSheetsClient(RECORDS, failures={'Events': 2}, retry_after=7)
+    sleeps = Sleeps()
+    scheduler = SheetsScheduler(sleep=sleeps, jitter=lambda: 0.0)
+    scheduler.run('Events', fetcher(client))
+    return [(sleeps.delays == [7.0, 7.0], f"each retry waits out Retry-After: 7 (slept {sleeps.delays})")]
+
+def check_gives_up():
+    results = []
+    for status, failures, calls in [(403, 1, 1), (429, 10, 4)]:
+        client = FakeSheetsClient(RECORDS, failures={'Events': failures}, status_code=status)
+        scheduler = SheetsScheduler(max_retries=3, sleep=Sleeps())
+        try:
+            scheduler.run('Events', fetcher(client))
+            raised = False
+        except Exception:
+            raised = True
+        results.append((
+            raised and client.calls['Events'] == calls,
+            f"{status} x{failures} is raised after {calls} call(s) (made {client.calls['Events']})"
+        ))
+    return results
+
+def check_single_flight(callers=5):
+    client = FakeSheetsClient(RECORDS, failures={'Events': 2}, latency=0.2)
+    scheduler = SheetsScheduler(base_delay=0.05)
+    start = threading.Barrier(callers)
+    results, errors = [], []
+
+    def read():
+        start.wait()
+        try:
+            results.append(scheduler.run('Events', fetcher(client)))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=read) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [
+        (not errors and len(results) == callers, f"all {callers} concurrent callers get the records ({len(errors)} errors)"),
+        (client.calls['Events'] == 3, f"they share one fetch: 2 failures and a success make 3 calls (made {client.calls['Events']})"),
+        (scheduler.stats['coalesced'] == callers - 1, f"{callers - 1} callers were coalesced ({scheduler.stats['coalesced']})"),
+    ]
+
+def main():
+    failures = 0
+    for check in [check_retries, check_retry_after, check_gives_up, check_single_flight]:
+        for passed, description in check():
+            print(f"{'ok  ' if passed else 'FAIL'} {description}")
+            failures += not passed
+    print("OK" if not failures else f"{failures} check(s) failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
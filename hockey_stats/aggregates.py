@@ -0,0 +1,148 @@
+import pandas as pd
+
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+PLAYER_GAME_COLUMNS = ['PlayerID', 'GameID', 'Present', 'Goals', 'Assists', 'Points', '+/-', 'Shots', 'PIM', 'PPG', 'SHG']
+
+SEASON_PLAYER_COLUMNS = ['PlayerID', 'FirstName', 'LastName', 'JerseyNumber', 'Position', 'GP', 'Goals', 'Assists', 'Points', '+/-', 'Shots']
+
+TEAM_GAME_COLUMNS = ['GameID', 'Shots', 'ShotsAgainst', 'PIM', 'PPG', 'PPO', 'SHG', 'PPGA', 'SHGA']
+
+def jersey_lookup(players_df):
+    """Map player ID to jersey number"""
+    if players_df.empty:
+        return pd.Series(dtype=object)
+    return players_df.set_index('ID')['JerseyNumber']
+
+def explode_players_on_ice(events_df):
+    """Return one row per (event, player) parsed from the YourTeamPlayersOnIce field
+
+    The result is a Series of cleaned player IDs indexed by the event's index,
+    so it can be joined back onto any column of events_df.
+    """
+    if events_df.empty:
+        return pd.Series(dtype=str)
+
+    on_ice = events_df['YourTeamPlayersOnIce'].str.split(',').explode()
+    return on_ice[on_ice.notna() & (on_ice != '')]
+
+def shots_on_goal(events_df):
+    """Which events are shots on goal: saved shots and goals, the one definition every table counts"""
+    return (events_df['EventType'] == 'Shot') | events_df['IsGoal']
+
+def _event_flags(events_df, our_team_id):
+    """Vectorized per-event flags shared by the player and team aggregates"""
+    is_goal = events_df['IsGoal']
+
+    return pd.DataFrame({
+        'GameID': events_df['GameID'],
+        'IsOurs': events_df['Team'] == our_team_id,
+        'IsGoal': is_goal,
+        'IsShot': shots_on_goal(events_df),
+        'IsPowerPlayChance': events_df['EventType'] == 'PowerPlay',
+        'IsPowerPlay': is_goal & events_df['IsPowerPlay'],
+        'IsShortHanded': is_goal & events_df['IsShortHanded'],
+        'PIM': events_df['PenaltyDuration'],
+    }, index=events_df.index)
+
+def calculate_player_game_stats(events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Aggregate each player's goals, assists, +/-, shots, PIM and special teams goals per game
+
+    Returns one row per (PlayerID, GameID) for every player who was marked
+    Present on the game roster or who appears in that game's events.
+    """
+    if events_df.empty:
+        return pd.DataFrame(columns=PLAYER_GAME_COLUMNS)
+
+    flags = _event_flags(events_df, our_team_id)
+    flags['PlayerID'] = events_df['PrimaryPlayerID']
+    keys = ['PlayerID', 'GameID']
+
+    # Primary player stats in one groupby
+    flags['Goals'] = flags['IsGoal'].astype(int)
+    flags['Shots'] = flags['IsShot'].astype(int)
+    flags['PPG'] = flags['IsPowerPlay'].astype(int)
+    flags['SHG'] = flags['IsShortHanded'].astype(int)
+    primary = flags[flags['PlayerID'] != ''].groupby(keys)[['Goals', 'Shots', 'PIM', 'PPG', 'SHG']].sum()
+
+    # Assists from both assist columns of goal events
+    goal_events = events_df[flags['IsGoal']]
+    assists = goal_events.melt(id_vars=['GameID'], value_vars=['AssistPlayer1ID', 'AssistPlayer2ID'], value_name='PlayerID')
+    assists = assists[assists['PlayerID'] != ''].groupby(keys).size().rename('Assists')
+
+    # Plus/minus from the on-ice sets of goal events
+    on_ice = explode_players_on_ice(goal_events)
+    plus_minus = pd.DataFrame({
+        'PlayerID': on_ice.to_numpy(),
+        'GameID': flags.loc[on_ice.index, 'GameID'].to_numpy(),
+        '+/-': flags.loc[on_ice.index, 'IsOurs'].map({True: 1, False: -1}).to_numpy(),
+    }).groupby(keys)['+/-'].sum()
+
+    # Roster presence
+    present = pd.Series(dtype=bool, name='Present')
+    if not game_roster_df.empty:
+        roster = game_roster_df[game_roster_df['Status'] == 'Present']
+        present = pd.Series(True, index=pd.MultiIndex.from_frame(roster[keys]), name='Present')
+
+    stats_df = pd.concat([present, primary, assists, plus_minus], axis=1)
+    stats_df['Present'] = stats_df['Present'].eq(True)
+    count_cols = ['Goals', 'Assists', '+/-', 'Shots', 'PIM', 'PPG', 'SHG']
+    stats_df[count_cols] = stats_df[count_cols].fillna(0).astype(int)
+    stats_df['Points'] = stats_df['Goals'] + stats_df['Assists']
+
+    stats_df = stats_df.rename_axis(keys).reset_index()
+    return stats_df[PLAYER_GAME_COLUMNS]
+
+def calculate_season_player_stats(players_df, player_game_df):
+    """Season totals for every player, with games played counted from the game roster"""
+    if players_df.empty:
+        return pd.DataFrame(columns=SEASON_PLAYER_COLUMNS)
+
+    totals = player_game_df.groupby('PlayerID').agg(
+        GP=('Present', 'sum'),
+        Goals=('Goals', 'sum'),
+        Assists=('Assists', 'sum'),
+        Points=('Points', 'sum'),
+        **{'+/-': ('+/-', 'sum')},
+        Shots=('Shots', 'sum'),
+    )
+
+    season_df = players_df[['ID', 'FirstName', 'LastName', 'JerseyNumber', 'Position']].rename(columns={'ID': 'PlayerID'})
+    season_df = season_df.merge(totals, left_on='PlayerID', right_index=True, how='left')
+    count_cols = ['GP', 'Goals', 'Assists', 'Points', '+/-', 'Shots']
+    season_df[count_cols] = season_df[count_cols].fillna(0).astype(int)
+    return season_df[SEASON_PLAYER_COLUMNS]
+
+def calculate_team_game_stats(events_df, our_team_id=OUR_TEAM_ID):
+    """Aggregate shots, penalty minutes and special teams figures for each game"""
+    if events_df.empty:
+        return pd.DataFrame(columns=TEAM_GAME_COLUMNS)
+
+    flags = _event_flags(events_df, our_team_id)
+    ours = flags['IsOurs']
+
+    per_event = pd.DataFrame({
+        'GameID': flags['GameID'],
+        'Shots': flags['IsShot'] & ours,
+        'ShotsAgainst': flags['IsShot'] & ~ours,
+        'PIM': flags['PIM'].where(ours, 0),
+        'PPG': flags['IsPowerPlay'] & ours,
+        'PPO': flags['IsPowerPlayChance'],
+        'SHG': flags['IsShortHanded'] & ours,
+        'PPGA': flags['IsPowerPlay'] & ~ours,
+        'SHGA': flags['IsShortHanded'] & ~ours,
+    })
+
+    team_df = per_event.groupby('GameID').sum().astype(int).reset_index()
+    return team_df[TEAM_GAME_COLUMNS]
+
+@shared_frame()
+def get_player_game_stats(events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached player-game aggregates for the currently loaded season"""
+    return calculate_player_game_stats(events_df, game_roster_df, our_team_id)
+
+@shared_frame()
+def get_season_player_stats(players_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached season table behind the leaderboards"""
+    return calculate_season_player_stats(players_df, get_player_game_stats(events_df, game_roster_df, our_team_id))
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from hockey_stats.aggregates import shots_on_goal
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+GOALIE_COLUMNS = ['PlayerID', 'JerseyNumber', 'FirstName', 'LastName', 'GP', 'GA', 'ShotsFaced', 'GAA', 'SV%', 'W', 'SO']
+
+def _matrix(players_df, games_df, player_ids, game_ids):
+    """Boolean players × games frame with True at each (player, game) pair given"""
+    index = pd.Index(players_df['ID'], name='PlayerID')
+    columns = pd.Index(games_df['GameID'], name='GameID')
+    rows = index.get_indexer(player_ids)
+    cols = columns.get_indexer(game_ids)
+    known = (rows >= 0) & (cols >= 0)
+
+    matrix = np.zeros((len(index), len(columns)), dtype=bool)
+    matrix[rows[known], cols[known]] = True
+    return pd.DataFrame(matrix, index=index, columns=columns)
+
+def calculate_appearances(players_df, games_df, game_roster_df, events_df):
+    """Who was at each game, as a boolean matrix of player IDs × game IDs
+
+    Read from the roster's Present entries. Games nobody entered a roster
+    for fall back to the players named in that game's events, as scorers,
+    assisters or on ice.
+    """
+    rostered_games = []
+    player_ids, game_ids = [], []
+    if not game_roster_df.empty:
+        rostered_games = game_roster_df['GameID'].unique()
+        present = game_roster_df[game_roster_df['Status'] == 'Present']
+        player_ids.append(present['PlayerID'])
+        game_ids.append(present['GameID'])
+
+    if not events_df.empty:
+        events = events_df[~events_df['GameID'].isin(rostered_games)]
+        on_ice = events['YourTeamPlayersOnIce'].str.split(',').explode()
+        for ids in [events['PrimaryPlayerID'], events['AssistPlayer1ID'], events['AssistPlayer2ID'], on_ice]:
+            player_ids.append(ids)
+            game_ids.append(events.loc[ids.index, 'GameID'])
+
+    if not player_ids:
+        return _matrix(players_df, games_df, [], [])
+    return _matrix(players_df, games_df, pd.concat(player_ids), pd.concat(game_ids))
+
+def _event_mentions(players_df, games_df, events_df):
+    """How many times each player is named in each game's events, as players × games counts"""
+    counts = np.zeros((len(players_df), len(games_df)), dtype=int)
+    if events_df.empty:
+        return counts
+    on_ice = events_df['YourTeamPlayersOnIce'].str.split(',').explode().str.strip()
+    ids = [events_df['PrimaryPlayerID'], events_df['AssistPlayer1ID'], events_df['AssistPlayer2ID'], on_ice]
+    rows = pd.Index(players_df['ID']).get_indexer(pd.concat(ids))
+    cols = pd.Index(games_df['GameID']).get_indexer(pd.concat([events_df.loc[i.index, 'GameID'] for i in ids]))
+    known = (rows >= 0) & (cols >= 0)
+    np.add.at(counts, (rows[known], cols[known]), 1)
+    return counts
+
+def calculate_starters(players_df, games_df, game_roster_df, events_df, appearances_df):
+    """Who started each game, in the same shape as the appearance matrix
+
+    From the roster's optional Starter column. In games without any starter
+    marked, one goalie is credited: the one named in most of the game's
+    events, or else the only goalie who appeared. Skaters who appeared count
+    as starters there.
+    """
+    starters_df = _matrix(players_df, games_df, [], [])
+    if starters_df.empty:
+        return starters_df
+    if not game_roster_df.empty and 'Starter' in game_roster_df.columns:
+        started = game_roster_df[game_roster_df['Starter'].eq(True) & (game_roster_df['Status'] == 'Present')]
+        starters_df = _matrix(players_df, games_df, started['PlayerID'], started['GameID'])
+    unmarked = ~starters_df.any(axis=0).to_numpy()
+
+    is_goalie = (players_df['Position'] == 'G').to_numpy()
+    appeared = appearances_df.to_numpy()
+    mentions = np.where(is_goalie[:, None], _event_mentions(players_df, games_df, events_df), 0)
+    lone_goalie = (appeared & is_goalie[:, None]).sum(axis=0) == 1
+
+    goalie = np.zeros_like(appeared)
+    named = unmarked & (mentions.max(axis=0, initial=0) > 0)
+    goalie[mentions.argmax(axis=0)[named], np.flatnonzero(named)] = True
+    alone = unmarked & ~named & lone_goalie
+    goalie[:, alone] = appeared[:, alone] & is_goalie[:, None]
+
+    skaters = appeared & ~is_goalie[:, None] & unmarked
+    return starters_df | pd.DataFrame(goalie | skaters, index=starters_df.index, columns=starters_df.columns)
+
+def games_played(appearances_df):
+    """Games played per player ID"""
+    return appearances_df.sum(axis=1)
+
+def appeared_in(appearances_df, player_id):
+    """Game IDs a player appeared in, in game order"""
+    if player_id not in appearances_df.index:
+        return appearances_df.columns[:0]
+    return appearances_df.columns[appearances_df.loc[player_id].to_numpy()]
+
+def was_present(appearances_df, player_id, game_id):
+    """Whether a player was at a game; False for unknown players or games"""
+    if player_id not in appearances_df.index or game_id not in appearances_df.columns:
+        return False
+    return bool(appearances_df.at[player_id, game_id])
+
+def calculate_goalie_stats(players_df, games_df, events_df, starters_df, our_team_id=OUR_TEAM_ID):
+    """Games, goals against, save percentage, wins and shutouts for every goalie
+
+    A goalie is credited with the games they started. Per-game goals and
+    shots against are computed once, and each goalie's totals are a
+    product of their row of the starter matrix with those game vectors.
+    """
+    goalies = players_df[players_df['Position'] == 'G']
+    if goalies.empty:
+        return pd.DataFrame(columns=GOALIE_COLUMNS)
+
+    game_ids = starters_df.columns
+    against = events_df[events_df['Team'] != our_team_id]
+    goals_against = against['IsGoal'].groupby(against['GameID']).sum().reindex(game_ids, fill_value=0).to_numpy()
+    shots_faced = (
+        shots_on_goal(against).groupby(against['GameID']).sum()
+        .reindex(game_ids, fill_value=0).to_numpy()
+    )
+    wins = (games_df.set_index('GameID')['Result'].reindex(game_ids) == 'W').to_numpy()
+
+    started = starters_df.loc[goalies['ID']].to_numpy().astype(int)
+    stats_df = goalies[['ID', 'JerseyNumber', 'FirstName', 'LastName']].rename(columns={'ID': 'PlayerID'})
+    stats_df['GP'] = started.sum(axis=1)
+    stats_df['GA'] = started @ goals_against
+    stats_df['ShotsFaced'] = started @ shots_faced
+    stats_df['W'] = started @ wins.astype(int)
+    stats_df['SO'] = started @ (goals_against == 0).astype(int)
+
+    played = stats_df['GP'].where(stats_df['GP'] > 0)
+    faced = stats_df['ShotsFaced'].where(stats_df['ShotsFaced'] > 0)
+    stats_df['GAA'] = (stats_df['GA'] / played).fillna(0)
+    stats_df['SV%'] = ((stats_df['ShotsFaced'] - stats_df['GA']) / faced).fillna(0)
+    return stats_df[GOALIE_COLUMNS].reset_index(drop=True)
+
+@shared_frame()
+def get_appearances(players_df, games_df, game_roster_df, events_df):
+    """Cached appearance matrix for the currently loaded season"""
+    return calculate_appearances(players_df, games_df, game_roster_df, events_df)
+
+@shared_frame()
+def get_goalie_stats(players_df, games_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached goalie table, built from the cached appearance matrix"""
+    appearances_df = get_appearances(players_df, games_df, game_roster_df, events_df)
+    starters_df = calculate_starters(players_df, games_df, game_roster_df, events_df, appearances_df)
+    return calculate_goalie_stats(players_df, games_df, events_df, starters_df, our_team_id)
@@ -0,0 +1,182 @@
+import argparse
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from hockey_stats.aggregates import SEASON_PLAYER_COLUMNS, calculate_player_game_stats, calculate_season_player_stats
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+from hockey_stats.versioning import stamp_fingerprint
+
+# Finished seasons are frozen to Parquet under archive/<Sheet>/season=<season>/team=<team>/
+ARCHIVE_DIR = Path(os.environ.get("HOCKEY_STATS_ARCHIVE", "archive"))
+
+ARCHIVE_TABLES = ['Games', 'Events', 'GameRoster', 'Players']
+
+# Hive-style partition keys; lowercase so they never clash with sheet columns
+PARTITIONING = ds.partitioning(pa.schema([('season', pa.string()), ('team', pa.string())]), flavor='hive')
+
+# Event columns the player aggregates read, so career queries skip the rest
+PLAYER_EVENT_COLUMNS = [
+    'GameID', 'EventType', 'Team', 'PrimaryPlayerID', 'AssistPlayer1ID', 'AssistPlayer2ID',
+    'IsGoal', 'IsPowerPlay', 'IsShortHanded', 'PenaltyDuration', 'YourTeamPlayersOnIce'
+]
+
+CAREER_COLUMNS = ['Season'] + SEASON_PLAYER_COLUMNS
+
+# Season picker entry for the live spreadsheet
+CURRENT_SEASON = "Current season"
+
+def table_path(table_name, archive_dir=None):
+    return Path(archive_dir or ARCHIVE_DIR) / table_name
+
+def freeze_season(frames, season, team=OUR_TEAM_ID, archive_dir=None):
+    """Write one season's sheets to the archive, replacing that season and team if already frozen
+
+    `frames` maps sheet names to frames cleaned by normalize_frame. Returns
+    the number of rows written per sheet.
+    """
+    written = {}
+    for table_name, df in frames.items():
+        if table_name not in ARCHIVE_TABLES or df.empty:
+            continue
+        frame = df.assign(season=str(season), team=str(team))
+        # Quarantine counts and sheet row counts describe the live frame, not the archive
+        frame.attrs = {}
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        ds.write_dataset(
+            table,
+            table_path(table_name, archive_dir),
+            format='parquet',
+            partitioning=PARTITIONING,
+            basename_template='part-{i}.parquet',
+            existing_data_behavior='delete_matching'
+        )
+        written[table_name] = len(df)
+    return written
+
+def archived_seasons(team=OUR_TEAM_ID, archive_dir=None):
+    """Seasons frozen for `team`, oldest first, read from the partition directories"""
+    games_dir = table_path('Games', archive_dir)
+    if not games_dir.is_dir():
+        return []
+    return sorted(
+        path.name.split('=', 1)[1]
+        for path in games_dir.glob('season=*')
+        if (path / f"team={team}").is_dir()
+    )
+
+def archive_version(team=OUR_TEAM_ID, archive_dir=None):
+    """Paths, sizes and modification times of a team's archived files
+
+    Changes whenever a season is frozen or frozen again, so caches keyed on
+    it never serve an archive that has since been rewritten.
+    """
+    files = []
+    for table_name in ARCHIVE_TABLES:
+        path = table_path(table_name, archive_dir)
+        for file in path.glob(f"season=*/team={team}/*.parquet"):
+            stat = file.stat()
+            files.append((str(file.relative_to(path.parent)), stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(files))
+
+def _isin(field, values):
+    return ds.field(field).isin([str(value) for value in values])
+
+def read_archive(table_name, seasons=None, teams=None, game_ids=None, columns=None, archive_dir=None):
+    """Rows of an archived sheet, with the filters pushed down to the Parquet reads
+
+    Season and team filters prune whole partitions; the game filter is
+    checked against row-group statistics before any rows are decoded. The
+    result carries `season` and `team` columns. GameIDs are only unique
+    within a season.
+    """
+    path = table_path(table_name, archive_dir)
+    if not path.is_dir():
+        return pd.DataFrame(columns=columns or [])
+
+    dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+    # Sheets gain columns over the years; read every season against the combined schema
+    schema = pa.unify_schemas([fragment.physical_schema for fragment in dataset.get_fragments()] + [PARTITIONING.schema])
+    dataset = ds.dataset(path, schema=schema, format='parquet', partitioning=PARTITIONING)
+
+    filters = []
+    if seasons is not None:
+        filters.append(_isin('season', seasons))
+    if teams is not None:
+        filters.append(_isin('team', teams))
+    if game_ids is not None:
+        filters.append(_isin('GameID', game_ids))
+    expression = None
+    for condition in filters:
+        expression = condition if expression is None else expression & condition
+
+    if columns is not None:
+        columns = [col for col in dict.fromkeys(list(columns) + ['season', 'team']) if col in schema.names]
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+def calculate_career_player_stats(team=OUR_TEAM_ID, seasons=None, archive_dir=None):
+    """Season-by-season player totals for every archived season of `team`
+
+    Each season is aggregated on its own, since game IDs restart every season.
+    """
+    filters = {'seasons': seasons, 'teams': [team], 'archive_dir': archive_dir}
+    players_df = read_archive('Players', **filters)
+    events_df = read_archive('Events', columns=PLAYER_EVENT_COLUMNS, **filters)
+    roster_df = read_archive('GameRoster', columns=['GameID', 'PlayerID', 'Status'], **filters)
+    if players_df.empty:
+        return pd.DataFrame(columns=CAREER_COLUMNS)
+
+    season_frames = []
+    for season, season_players in players_df.groupby('season', sort=True):
+        season_events = events_df[events_df['season'] == season]
+        season_roster = roster_df[roster_df['season'] == season] if not roster_df.empty else roster_df
+        player_game_df = calculate_player_game_stats(season_events, season_roster, team)
+        season_frames.append(calculate_season_player_stats(season_players, player_game_df).assign(Season=season))
+    return pd.concat(season_frames, ignore_index=True)[CAREER_COLUMNS]
+
+@shared_frame()
+def get_archived_table(table_name, season, version, team=OUR_TEAM_ID):
+    """Cached sheet of one archived season, shaped like the live loaders' output
+
+    `version` is the archive_version() read once for the rerun, so a season
+    frozen again is picked up on the next rerun.
+    """
+    df = read_archive(table_name, seasons=[season], teams=[team])
+    return stamp_fingerprint(df.drop(columns=['season', 'team'], errors='ignore'))
+
+@shared_frame()
+def get_career_player_stats(version, team=OUR_TEAM_ID):
+    """Cached season-by-season totals from the archive, rebuilt for each new archive_version()"""
+    return calculate_career_player_stats(team)
+
+def main():
+    """Command line entry point: python -m hockey_stats.archive freeze 2024-25"""
+    parser = argparse.ArgumentParser(description="Freeze finished seasons into the columnar archive")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    freeze = subparsers.add_parser('freeze', help="Archive the season currently in the spreadsheet")
+    freeze.add_argument('season', help="Season label, e.g. 2024-25")
+    freeze.add_argument('--team', default=OUR_TEAM_ID)
+    subparsers.add_parser('list', help="List archived seasons")
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for season in archived_seasons():
+            print(season)
+        return
+
+    from hockey_stats.sheets_service import get_events_data, get_game_roster_data, get_games_data, get_players_data
+    frames = {
+        'Games': get_games_data(),
+        'Events': get_events_data(),
+        'GameRoster': get_game_roster_data(),
+        'Players': get_players_data(),
+    }
+    for table_name, rows in freeze_season(frames, args.season, args.team).items():
+        print(f"{table_name}: archived {rows} rows for {args.season}")
+
+if __name__ == "__main__":
+    main()
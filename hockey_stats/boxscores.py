@@ -0,0 +1,112 @@
+import pandas as pd
+
+from hockey_stats.aggregates import get_player_game_stats, shots_on_goal
+from hockey_stats.dates import calculate_game_index, game_options
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+TEAM_BOX_COLUMNS = [
+    'Label', 'Date', 'Opponent', 'Result', 'GoalsFor', 'GoalsAgainst',
+    'Shots', 'PIM', 'PPG', 'PPO', 'PP%'
+]
+
+SKATER_BOX_COLUMNS = ['Goals', 'Assists', 'Points', '+/-', 'Shots', 'PIM']
+
+GOALIE_BOX_COLUMNS = ['GA', 'Saves', 'SV%']
+
+PLAYER_BOX_COLUMNS = ['PlayerID', 'JerseyNumber', 'FirstName', 'LastName', 'Position'] + SKATER_BOX_COLUMNS + GOALIE_BOX_COLUMNS
+
+def calculate_team_box_scores(games_df, events_df):
+    """Score line, shots, penalty minutes and power play for every game, indexed by GameID
+
+    Shots, penalty minutes and power play figures count both teams' events.
+    Rows are in game selector order: by date, most recent first.
+    """
+    if games_df.empty:
+        return pd.DataFrame(columns=TEAM_BOX_COLUMNS)
+
+    box_df = games_df[['GameID', 'Date', 'Opponent', 'Result', 'GoalsFor', 'GoalsAgainst']].set_index('GameID')
+    labels, game_ids = game_options(calculate_game_index(games_df))
+    box_df = box_df.loc[game_ids].assign(Label=labels)
+
+    per_event = pd.DataFrame({
+        'Shots': shots_on_goal(events_df),
+        'PIM': events_df['PenaltyDuration'],
+        'PPG': events_df['IsPowerPlay'],
+        'PPO': events_df['EventType'] == 'PowerPlay',
+    })
+    box_df = box_df.join(per_event.groupby(events_df['GameID']).sum())
+    count_cols = ['Shots', 'PIM', 'PPG', 'PPO']
+    box_df[count_cols] = box_df[count_cols].fillna(0).astype(int)
+    box_df['PP%'] = (box_df['PPG'] / box_df['PPO'].where(box_df['PPO'] > 0) * 100).fillna(0)
+
+    return box_df[TEAM_BOX_COLUMNS]
+
+def calculate_player_box_scores(players_df, games_df, player_game_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Every player's line in every game, indexed by GameID and sorted by position and jersey
+
+    A game's box lists the players marked Present on its roster, or the
+    whole team when that game has no roster. Goalies get goals against,
+    saves and save percentage in games where they appear in the events.
+    """
+    if players_df.empty or games_df.empty:
+        return pd.DataFrame(columns=PLAYER_BOX_COLUMNS).rename_axis('GameID')
+
+    players = players_df[['ID', 'JerseyNumber', 'FirstName', 'LastName', 'Position']].rename(columns={'ID': 'PlayerID'})
+
+    # Games with a roster list who was there; the rest list everyone
+    rostered_games = game_roster_df['GameID'].unique() if not game_roster_df.empty else []
+    rostered = player_game_df['GameID'].isin(rostered_games)
+    lines = pd.concat([
+        player_game_df[rostered & player_game_df['Present']],
+        players[['PlayerID']].merge(
+            games_df.loc[~games_df['GameID'].isin(rostered_games), ['GameID']],
+            how='cross'
+        ).merge(player_game_df, on=['PlayerID', 'GameID'], how='left'),
+    ], ignore_index=True)
+    lines = lines.merge(players, on='PlayerID')
+
+    # Goals and shots against per game, for the goalies' lines
+    against = events_df[events_df['Team'] != our_team_id]
+    goalie_game = pd.DataFrame({
+        'GA': against['IsGoal'].groupby(against['GameID']).sum(),
+        'ShotsFaced': shots_on_goal(against).groupby(against['GameID']).sum(),
+    })
+    involved = pd.MultiIndex.from_frame(events_df[['PrimaryPlayerID', 'GameID']].drop_duplicates())
+    is_goalie = lines['Position'] == 'G'
+    played = pd.MultiIndex.from_frame(lines[['PlayerID', 'GameID']]).isin(involved)
+    lines = lines[~is_goalie | played]
+    is_goalie = lines['Position'] == 'G'
+
+    # Skaters leave the goalie columns blank and goalies the skater columns
+    faced = lines['GameID'].map(goalie_game['ShotsFaced']).fillna(0).astype(int)
+    goals_against = lines['GameID'].map(goalie_game['GA']).fillna(0).astype(int)
+    lines[SKATER_BOX_COLUMNS] = lines[SKATER_BOX_COLUMNS].fillna(0).astype('Int64').mask(is_goalie)
+    lines['GA'] = goals_against.astype('Int64').where(is_goalie)
+    lines['Saves'] = (faced - goals_against).astype('Int64').where(is_goalie)
+    lines['SV%'] = ((faced - goals_against) / faced.where(faced > 0)).fillna(0).where(is_goalie)
+
+    lines = lines.sort_values(by=['GameID', 'Position', 'JerseyNumber'], kind='stable')
+    return lines.set_index('GameID')[PLAYER_BOX_COLUMNS]
+
+def game_box_score(team_box_df, player_box_df, game_id):
+    """The precomputed box score of one game: its team row and its player lines"""
+    player_lines = player_box_df.loc[[game_id]] if game_id in player_box_df.index else player_box_df.iloc[0:0]
+    return team_box_df.loc[game_id], player_lines.reset_index(drop=True)
+
+@shared_frame()
+def get_team_box_scores(games_df, events_df):
+    """Cached team box scores for every game"""
+    return calculate_team_box_scores(games_df, events_df)
+
+@shared_frame()
+def get_player_box_scores(players_df, games_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached player box scores for every game, built from the cached player-game aggregates"""
+    return calculate_player_box_scores(
+        players_df,
+        games_df,
+        get_player_game_stats(events_df, game_roster_df, our_team_id),
+        events_df,
+        game_roster_df,
+        our_team_id
+    )
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from hockey_stats.aggregates import explode_players_on_ice, shots_on_goal
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+# Score state at the moment of an event, from our team's point of view
+GAME_STATES = ['Leading', 'Tied', 'Trailing']
+
+TEAM_BREAKDOWN_COLUMNS = ['GameID', 'Split', 'Segment', 'GF', 'GA', 'Shots', 'ShotsAgainst', 'PIM', 'PIMAgainst']
+
+PLAYER_BREAKDOWN_COLUMNS = ['PlayerID', 'GameID', 'Split', 'Segment', 'Goals', 'Assists', 'Points', 'Shots', 'PIM', '+/-']
+
+def clock_seconds(times):
+    """Seconds from 'mm:ss' game clock strings; anything unparseable becomes NaN"""
+    parts = times.str.split(':', n=1, expand=True).reindex(columns=[0, 1])
+    minutes = pd.to_numeric(parts[0], errors='coerce')
+    seconds = pd.to_numeric(parts[1], errors='coerce').fillna(0)
+    return minutes * 60 + seconds
+
+def period_order(periods):
+    """Sort key for period labels: numbered periods in order, then overtime and any others"""
+    return pd.to_numeric(periods, errors='coerce').fillna(np.inf)
+
+def calculate_game_states(events_df, our_team_id=OUR_TEAM_ID):
+    """Game state each event happened in, from a running goal differential per game
+
+    Events are put in time order within each game, and the differential
+    before each event decides its state. A goal therefore counts in the
+    state it was scored from: the go-ahead goal from a tie is a tied goal.
+    """
+    if events_df.empty:
+        return pd.Series(dtype=object)
+
+    order = pd.DataFrame({
+        'GameID': events_df['GameID'],
+        'Period': period_order(events_df['Period']),
+        'Clock': clock_seconds(events_df['Time']),
+    }).sort_values(by=['GameID', 'Period', 'Clock'], kind='stable', na_position='last')
+    ordered = events_df.loc[order.index]
+
+    scored = np.where(ordered['Team'] == our_team_id, 1, -1) * ordered['IsGoal'].to_numpy()
+    running = pd.Series(scored, index=ordered.index).groupby(ordered['GameID']).cumsum()
+    before = running - scored
+
+    states = np.select([before > 0, before < 0], ['Leading', 'Trailing'], default='Tied')
+    return pd.Series(states, index=ordered.index).reindex(events_df.index)
+
+def _stack_splits(values_df, events_df, states):
+    """Stack per-event values once under the event's period and once under its game state"""
+    has_period = (events_df['Period'] != '').to_numpy()
+    by_period = values_df[has_period].assign(Split='Period', Segment=events_df['Period'].to_numpy()[has_period])
+    by_state = values_df.assign(Split='State', Segment=states.to_numpy())
+    return pd.concat([by_period, by_state], ignore_index=True)
+
+def calculate_team_breakdowns(events_df, our_team_id=OUR_TEAM_ID):
+    """Goals, shots and penalty minutes for and against, by period and by game state, for every game"""
+    if events_df.empty:
+        return pd.DataFrame(columns=TEAM_BREAKDOWN_COLUMNS)
+
+    ours = events_df['Team'] == our_team_id
+    is_goal = events_df['IsGoal']
+    is_shot = shots_on_goal(events_df)
+    per_event = pd.DataFrame({
+        'GameID': events_df['GameID'],
+        'GF': is_goal & ours,
+        'GA': is_goal & ~ours,
+        'Shots': is_shot & ours,
+        'ShotsAgainst': is_shot & ~ours,
+        'PIM': events_df['PenaltyDuration'].where(ours, 0),
+        'PIMAgainst': events_df['PenaltyDuration'].where(~ours, 0),
+    })
+
+    stacked = _stack_splits(per_event, events_df, calculate_game_states(events_df, our_team_id))
+    team_df = stacked.groupby(['GameID', 'Split', 'Segment']).sum().astype(int).reset_index()
+    return team_df[TEAM_BREAKDOWN_COLUMNS]
+
+def calculate_player_breakdowns(events_df, our_team_id=OUR_TEAM_ID):
+    """Each player's goals, assists, shots, PIM and +/- by period and by game state, for every game
+
+    Primary player, assist and on-ice rows are gathered for all events at
+    once and grouped in a single pass.
+    """
+    if events_df.empty:
+        return pd.DataFrame(columns=PLAYER_BREAKDOWN_COLUMNS)
+
+    states = calculate_game_states(events_df, our_team_id)
+    is_goal = events_df['IsGoal']
+
+    primary = pd.DataFrame({
+        'PlayerID': events_df['PrimaryPlayerID'],
+        'Goals': is_goal.astype(int),
+        'Shots': shots_on_goal(events_df).astype(int),
+        'PIM': events_df['PenaltyDuration'],
+    })
+    goal_events = events_df[is_goal]
+    assists = pd.concat([
+        pd.DataFrame({'PlayerID': goal_events[col], 'Assists': 1}) for col in ['AssistPlayer1ID', 'AssistPlayer2ID']
+    ])
+    on_ice = explode_players_on_ice(goal_events)
+    plus_minus = pd.DataFrame({
+        'PlayerID': on_ice,
+        '+/-': (goal_events.loc[on_ice.index, 'Team'] == our_team_id).map({True: 1, False: -1}),
+    })
+
+    # Every contribution keeps its event's index, so period and state line up with it
+    contributions = pd.concat([primary, assists, plus_minus]).fillna(0)
+    contributions = contributions[contributions['PlayerID'] != '']
+    events = events_df.loc[contributions.index]
+    contributions = contributions.assign(GameID=events['GameID'].to_numpy()).reset_index(drop=True)
+
+    stacked = _stack_splits(contributions, events, states.loc[events.index])
+    player_df = stacked.groupby(['PlayerID', 'GameID', 'Split', 'Segment']).sum().astype(int).reset_index()
+    player_df['Points'] = player_df['Goals'] + player_df['Assists']
+    return player_df[PLAYER_BREAKDOWN_COLUMNS]
+
+def summarize_breakdowns(breakdown_df, split, game_id=None, by=None):
+    """Totals per segment of one split, for one game or the whole season, in period or state order
+
+    `by` adds grouping columns such as 'PlayerID' ahead of the segment.
+    """
+    rows = breakdown_df[breakdown_df['Split'] == split]
+    if game_id is not None:
+        rows = rows[rows['GameID'] == game_id]
+    keys = (by or []) + ['Segment']
+    summary = rows.drop(columns=['GameID', 'Split']).groupby(keys, as_index=False).sum()
+
+    if split == 'State':
+        order = summary['Segment'].map({state: i for i, state in enumerate(GAME_STATES)})
+    else:
+        order = period_order(summary['Segment'])
+    return summary.assign(_order=order).sort_values(by=(by or []) + ['_order', 'Segment']).drop(columns='_order')
+
+@shared_frame()
+def get_team_breakdowns(events_df, our_team_id=OUR_TEAM_ID):
+    """Cached team splits by period and game state for every game"""
+    return calculate_team_breakdowns(events_df, our_team_id)
+
+@shared_frame()
+def get_player_breakdowns(events_df, our_team_id=OUR_TEAM_ID):
+    """Cached player splits by period and game state for every game"""
+    return calculate_player_breakdowns(events_df, our_team_id)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from hockey_stats.aggregates import get_player_game_stats
+from hockey_stats.breakdowns import GAME_STATES, get_player_breakdowns, period_order
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+SEASON_LINE_COLUMNS = ['GP', 'Goals', 'Assists', 'Points', '+/-', 'Shots', 'PIM', 'PPG', 'SHG']
+
+RATE_COLUMNS = ['Goals/GP', 'Assists/GP', 'Points/GP', 'Shots/GP', 'PIM/GP', 'Shooting %']
+
+# Per-game rates drawn on the comparison chart, each scaled against the roster's best
+CHART_METRICS = ['Goals/GP', 'Assists/GP', 'Points/GP', 'Shots/GP', '+/-/GP']
+
+def calculate_comparison_table(players_df, player_game_df, player_breakdowns_df):
+    """Season line, per-game rates and points splits for every player, indexed by player ID
+
+    Built for the whole roster at once, so comparing any set of players is
+    a row lookup rather than a fresh aggregation per player.
+    """
+    if players_df.empty:
+        return pd.DataFrame()
+
+    table = players_df[['ID', 'FirstName', 'LastName', 'JerseyNumber', 'Position']].set_index('ID')
+
+    season = player_game_df.groupby('PlayerID').agg(
+        GP=('Present', 'sum'),
+        **{col: (col, 'sum') for col in SEASON_LINE_COLUMNS[1:]}
+    )
+    table = table.join(season)
+    table[SEASON_LINE_COLUMNS] = table[SEASON_LINE_COLUMNS].fillna(0).astype(int)
+
+    # Per-game rates; a player with no games played has no rates
+    games_played = table['GP'].where(table['GP'] > 0)
+    table['Goals/GP'] = table['Goals'] / games_played
+    table['Assists/GP'] = table['Assists'] / games_played
+    table['Points/GP'] = table['Points'] / games_played
+    table['Shots/GP'] = table['Shots'] / games_played
+    table['PIM/GP'] = table['PIM'] / games_played
+    table['+/-/GP'] = table['+/-'] / games_played
+    table['Shooting %'] = table['Goals'] / (table['Goals'] + table['Shots']).where(lambda shots: shots > 0) * 100
+
+    # Points by game state and by period, one column per segment
+    if not player_breakdowns_df.empty:
+        splits = player_breakdowns_df.groupby(['PlayerID', 'Split', 'Segment'])['Points'].sum()
+        state_points = splits.xs('State', level='Split').unstack().reindex(columns=GAME_STATES)
+        periods = splits.xs('Period', level='Split').unstack()
+        periods = periods[periods.columns[np.argsort(period_order(pd.Series(periods.columns)).to_numpy(), kind='stable')]]
+        table = table.join(state_points.add_prefix('Pts ')).join(periods.add_prefix('Pts P'))
+        split_cols = [col for col in table.columns if col.startswith('Pts ')]
+        table[split_cols] = table[split_cols].fillna(0).astype(int)
+
+    return table.round(2)
+
+def compare_players(comparison_df, player_ids):
+    """Rows of the comparison table for the chosen players, in the order given"""
+    return comparison_df.loc[[pid for pid in player_ids if pid in comparison_df.index]]
+
+def comparison_chart_data(comparison_df, player_ids, labels):
+    """Long-form chart data: each chosen player's per-game rates scaled 0-100 against the roster's best
+
+    One row per (Player, Metric), ready for a grouped bar or radar chart.
+    `labels` maps player IDs to the names shown on the chart.
+    """
+    rates = comparison_df[CHART_METRICS].astype(float)
+    best = rates.abs().max().replace(0, np.nan)
+    scaled = (compare_players(rates, player_ids) / best * 100).fillna(0).round(1)
+    scaled.index = scaled.index.map(lambda pid: labels.get(pid, pid))
+    return scaled.rename_axis('Player').reset_index().melt(id_vars='Player', var_name='Metric', value_name='Score')
+
+@shared_frame()
+def get_comparison_table(players_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached comparison table for the whole roster"""
+    return calculate_comparison_table(
+        players_df,
+        get_player_game_stats(events_df, game_roster_df, our_team_id),
+        get_player_breakdowns(events_df, our_team_id)
+    )
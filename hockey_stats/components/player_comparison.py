@@ -0,0 +1,89 @@
+import streamlit as st
+from hockey_stats.comparison import RATE_COLUMNS, SEASON_LINE_COLUMNS, compare_players, comparison_chart_data, get_comparison_table
+from hockey_stats.search import get_player_options
+
+def player_comparison_view(players_df, games_df, events_df, game_roster_df):
+    """
+    Display season lines, per-game rates and splits for a set of players side by side
+    
+    Args:
+        players_df: DataFrame containing player information
+        games_df: DataFrame containing game information
+        events_df: DataFrame containing game events
+        game_roster_df: DataFrame containing game roster information
+    """
+    # Use both native Streamlit heading and a custom div for Android compatibility
+    st.subheader("Compare Players")
+    st.markdown('<div class="android-heading-fallback">Compare Players</div>', unsafe_allow_html=True)
+    
+    # Check if data is available
+    if players_df.empty:
+        st.warning("No player data available. Please check your data source.")
+        return
+    
+    # Player selection - show only jersey numbers, like the player selector
+    player_options_df = get_player_options(players_df)
+    player_labels = dict(zip(player_options_df['ID'], player_options_df['Label']))
+    
+    selected_player_ids = st.multiselect(
+        "Players",
+        options=list(player_labels),
+        format_func=lambda pid: player_labels.get(pid, pid),
+        key="compare_players",
+        placeholder="Choose players to compare"
+    )
+    
+    if not selected_player_ids:
+        st.info("Choose players to compare.")
+        return
+    
+    # The whole roster's table is cached per data version; the selection is a row lookup
+    comparison_df = get_comparison_table(players_df, events_df, game_roster_df)
+    selected_df = compare_players(comparison_df, selected_player_ids)
+    selected_df.insert(0, 'Player', selected_df.index.map(player_labels))
+    
+    # Season lines
+    st.markdown("---")
+    # Use both native Streamlit heading and a custom div for Android compatibility
+    st.markdown("### Season Lines")
+    st.markdown('<div class="android-heading-fallback">Season Lines</div>', unsafe_allow_html=True)
+    
+    st.dataframe(
+        selected_df[['Player', 'Position'] + SEASON_LINE_COLUMNS],
+        column_config={col: st.column_config.NumberColumn(col) for col in SEASON_LINE_COLUMNS},
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    # Per-game rates and scoring splits
+    st.markdown("### Rates & Splits")
+    st.markdown('<div class="android-heading-fallback">Rates & Splits</div>', unsafe_allow_html=True)
+    
+    split_cols = [col for col in selected_df.columns if col.startswith('Pts ')]
+    st.dataframe(
+        selected_df[['Player'] + RATE_COLUMNS + split_cols],
+        column_config={
+            **{col: st.column_config.NumberColumn(col, format="%.2f") for col in RATE_COLUMNS},
+            'Shooting %': st.column_config.NumberColumn('Shooting %', format="%.1f%%"),
+            **{col: st.column_config.NumberColumn(col.replace('Pts ', 'Pts: ')) for col in split_cols}
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    # Per-game rates scaled against the roster's best, one bar per player
+    chart_df = comparison_chart_data(comparison_df, selected_player_ids, player_labels)
+    st.caption("Per-game rates as a share of the best on the roster")
+    st.vega_lite_chart(
+        chart_df,
+        {
+            'mark': {'type': 'bar', 'tooltip': True},
+            'encoding': {
+                'x': {'field': 'Metric', 'type': 'nominal', 'axis': {'labelAngle': 0, 'title': None}},
+                'xOffset': {'field': 'Player', 'type': 'nominal'},
+                'y': {'field': 'Score', 'type': 'quantitative', 'scale': {'domain': [-100, 100]}, 'title': '% of best'},
+                'color': {'field': 'Player', 'type': 'nominal'}
+            }
+        },
+        use_container_width=True
+    )
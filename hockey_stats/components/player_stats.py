@@ -1,8 +1,15 @@
 import streamlit as st
 import pandas as pd
-from hockey_stats.utils import display_metric, format_player_name
+from hockey_stats.aggregates import get_player_game_stats
+from hockey_stats.appearances import appeared_in, get_appearances
+from hockey_stats.archive import get_career_player_stats
+from hockey_stats.dates import game_options, get_game_index, order_by_date
+from hockey_stats.trends import TREND_WINDOWS, downsample, get_player_trends
+from hockey_stats.search import get_player_options, get_player_tokens, search_players
+from hockey_stats.similarity import get_feature_matrix, get_player_rates, similar_players
+from hockey_stats.utils import display_metric, format_player_name, render_paged_dataframe
 
-def player_stats_view(players_df, games_df, events_df, game_roster_df):
+def player_stats_view(players_df, games_df, events_df, game_roster_df, archive_key=None):
     """
     Display the player stats view with game selection and statistics
     
@@ -11,6 +18,7 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
         games_df: DataFrame containing game information
         events_df: DataFrame containing game events
         game_roster_df: DataFrame containing game roster information
+        archive_key: archive_version() for this rerun, or None when no season is archived
     """
     # Use both native Streamlit heading and a custom div for Android compatibility
     st.subheader("My Player's Stats")
@@ -21,32 +29,35 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
         st.warning("No player data available. Please check your data source.")
         return
     
-    # Player selection - show only jersey numbers
-    player_options = []
-    for _, player in players_df.iterrows():
-        jersey_number = player.get('JerseyNumber', '')
-        player_id = player.get('ID', '')
-        player_options.append((f"#{jersey_number}", player_id))
+    # Player selection - search by name, jersey, team or position, but show only jersey numbers
+    player_options_df = get_player_options(players_df)
     
-    if not player_options:
+    if player_options_df.empty:
         st.warning("No players found in the database.")
         return
     
-    # Sort players by jersey number
-    player_options.sort(key=lambda x: x[0])
+    query = st.text_input(
+        "Find Player",
+        key="player_search",
+        placeholder="Name, jersey #, team or position"
+    )
+    matches_df = search_players(player_options_df, get_player_tokens(players_df), query)
+    
+    if matches_df.empty:
+        st.info(f"No players match \"{query}\".")
+        return
     
-    # Create a list of player names for the selectbox
-    player_names = [name for name, _ in player_options]
-    player_ids = [id for _, id in player_options]
+    player_labels = matches_df['Label'].tolist()
+    player_ids = matches_df['ID'].tolist()
     
     selected_player_index = st.selectbox(
         "Select Player", 
-        range(len(player_names)),
-        format_func=lambda i: player_names[i]
+        range(len(player_labels)),
+        format_func=lambda i: player_labels[i]
     )
     
     selected_player_id = player_ids[selected_player_index]
-    selected_player = players_df[players_df['ID'] == selected_player_id].iloc[0]
+    selected_player = player_options_df.loc[selected_player_id]
     
     # Display player info
     col1, col2 = st.columns([1, 3])
@@ -66,20 +77,9 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
     st.subheader("Game Statistics")
     st.markdown('<div class="android-heading-fallback">Game Statistics</div>', unsafe_allow_html=True)
     
-    # Filter games where this player was present using game roster
-    if not game_roster_df.empty:
-        player_roster_entries = game_roster_df[
-            (game_roster_df['PlayerID'] == selected_player_id) & 
-            (game_roster_df['Status'] == 'Present')
-        ]
-        player_game_ids = player_roster_entries['GameID'].unique() if not player_roster_entries.empty else []
-    else:
-        # Fallback to old method if no roster data
-        player_events = events_df[events_df['PrimaryPlayerID'] == selected_player_id]
-        assist1_events = events_df[events_df['AssistPlayer1ID'] == selected_player_id]
-        assist2_events = events_df[events_df['AssistPlayer2ID'] == selected_player_id]
-        all_player_events = pd.concat([player_events, assist1_events, assist2_events]).drop_duplicates()
-        player_game_ids = all_player_events['GameID'].unique() if not all_player_events.empty else []
+    # Games this player was present for, from the cached appearance matrix
+    # (roster entries, or the game's events when nobody entered a roster)
+    player_game_ids = appeared_in(get_appearances(players_df, games_df, game_roster_df, events_df), selected_player_id)
     
     if not len(player_game_ids):
         first_name = selected_player.get('FirstName', 'Player')
@@ -87,26 +87,14 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
         st.info(f"No game data available for {first_name} {last_name}.")
         return
     
-    # Filter games to only those where the player was present
-    player_games = games_df[games_df['GameID'].isin(player_game_ids)]
+    # Games where the player was present, most recent first, from the cached date index
+    game_index_df = get_game_index(games_df)
+    game_labels, game_ids = game_options(game_index_df, player_game_ids)
     
-    if player_games.empty:
+    if not game_ids:
         st.info("No game data available for this player.")
         return
     
-    # Create game options for selection
-    game_options = []
-    for _, game in player_games.iterrows():
-        game_date = game.get('Date', 'Unknown Date')
-        opponent = game.get('Opponent', 'Unknown')
-        game_options.append((f"{game_date} vs {opponent}", game.get('GameID', '')))
-    
-    # Sort games by date (most recent first)
-    game_options.sort(key=lambda x: x[0], reverse=True)
-    
-    game_labels = [label for label, _ in game_options]
-    game_ids = [id for _, id in game_options]
-    
     selected_game_index = st.selectbox(
         "Select Game", 
         range(len(game_labels)),
@@ -116,41 +104,15 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
     selected_game_id = game_ids[selected_game_index]
     selected_game = games_df[games_df['GameID'] == selected_game_id].iloc[0]
     
-    # Get player stats for the selected game
-    game_events = events_df[events_df['GameID'] == selected_game_id]
-    player_game_events = game_events[game_events['PrimaryPlayerID'] == selected_player_id]
-    
-    # Calculate player stats for this game
-    goals = player_game_events['IsGoal'].sum() if 'IsGoal' in player_game_events.columns else 0
-    
-    # Calculate assists (player is in assist columns)
-    assists = 0
-    for _, event in game_events[game_events['IsGoal'] == True].iterrows():
-        if event.get('AssistPlayer1ID') == selected_player_id or event.get('AssistPlayer2ID') == selected_player_id:
-            assists += 1
-    
-    # Calculate other stats
-    shots = len(player_game_events[player_game_events['EventType'] == 'Shot']) if 'EventType' in player_game_events.columns else 0
-    penalty_minutes = player_game_events['PenaltyDuration'].sum() if 'PenaltyDuration' in player_game_events.columns else 0
-    
-    # Calculate plus/minus
-    plus_minus = 0
-    if 'YourTeamPlayersOnIce' in game_events.columns:
-        for _, event in game_events[game_events['IsGoal'] == True].iterrows():
-            if pd.notna(event.get('YourTeamPlayersOnIce')):
-                # More robust parsing of YourTeamPlayersOnIce field
-                raw_players = str(event.get('YourTeamPlayersOnIce', ''))
-                players_on_ice_raw = raw_players.split(',')
-                players_on_ice = []
-                for p in players_on_ice_raw:
-                    p_clean = p.strip().replace('player_', '')
-                    players_on_ice.append(p_clean)
-                
-                if selected_player_id in players_on_ice:
-                    if event.get('Team') == 'your_team':  # Adjust based on your team ID
-                        plus_minus += 1
-                    else:
-                        plus_minus -= 1
+    # The player's games from the cached player-game aggregates, shared by
+    # the game, season and game log panels so they always agree
+    player_games_df = get_player_game_stats(events_df, game_roster_df)
+    player_rows_df = player_games_df[
+        (player_games_df['PlayerID'] == selected_player_id) & 
+        (player_games_df['GameID'].isin(player_game_ids))
+    ]
+    stat_cols = ['Goals', 'Assists', 'Points', '+/-', 'Shots', 'PIM']
+    game_totals = player_rows_df.loc[player_rows_df['GameID'] == selected_game_id, stat_cols].sum()
     
     # Use both native Streamlit heading and a custom div for Android compatibility
     st.markdown(f"### Game: {selected_game.get('Date', '')} vs {selected_game.get('Opponent', '')}")
@@ -160,12 +122,12 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
     game_stats_df = pd.DataFrame({
         'Metric': ['Goals', 'Assists', 'Points', 'Plus/Minus', 'Shots', 'PIM'],
         'Value': [
-            goals,
-            assists,
-            goals + assists,
-            plus_minus,
-            shots,
-            penalty_minutes
+            game_totals['Goals'],
+            game_totals['Assists'],
+            game_totals['Points'],
+            game_totals['+/-'],
+            game_totals['Shots'],
+            game_totals['PIM']
         ]
     })
 
@@ -189,64 +151,27 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
     # Calculate games played
     games_played = len(player_game_ids)
     
-    # Calculate season totals (only for games where player was present)
-    season_events = events_df[
-        (events_df['PrimaryPlayerID'] == selected_player_id) & 
-        (events_df['GameID'].isin(player_game_ids))
-    ]
-    
-    # Goals
-    season_goals = season_events['IsGoal'].sum() if 'IsGoal' in season_events.columns else 0
-    
-    # Assists
-    season_assists = 0
-    for game_id in player_game_ids:
-        game_events = events_df[events_df['GameID'] == game_id]
-        for _, event in game_events[game_events['IsGoal'] == True].iterrows():
-            if event.get('AssistPlayer1ID') == selected_player_id or event.get('AssistPlayer2ID') == selected_player_id:
-                season_assists += 1
-    
-    # Other stats
-    season_shots = len(season_events[season_events['EventType'] == 'Shot']) if 'EventType' in season_events.columns else 0
-    season_pim = season_events['PenaltyDuration'].sum() if 'PenaltyDuration' in season_events.columns else 0
-    
-    # Calculate season plus/minus
-    season_plus_minus = 0
-    if 'YourTeamPlayersOnIce' in events_df.columns:
-        for _, event in events_df[events_df['IsGoal'] == True].iterrows():
-            if pd.notna(event.get('YourTeamPlayersOnIce')):
-                # More robust parsing of YourTeamPlayersOnIce field
-                raw_players = str(event.get('YourTeamPlayersOnIce', ''))
-                players_on_ice_raw = raw_players.split(',')
-                players_on_ice = []
-                for p in players_on_ice_raw:
-                    p_clean = p.strip().replace('player_', '')
-                    players_on_ice.append(p_clean)
-                
-                if selected_player_id in players_on_ice:
-                    if event.get('Team') == 'your_team':  # Adjust based on your team ID
-                        season_plus_minus += 1
-                    else:
-                        season_plus_minus -= 1
+    # Season totals over the games the player was present for
+    season_totals = player_rows_df[stat_cols].sum()
     
     # Use both native Streamlit heading and a custom div for Android compatibility
     st.markdown("### Season Statistics")
     st.markdown('<div class="android-heading-fallback">Season Statistics</div>', unsafe_allow_html=True)
     
     # Calculate goals per game
-    gpg = season_goals / games_played if games_played > 0 else 0
+    gpg = season_totals['Goals'] / games_played if games_played > 0 else 0
     
     # Create a DataFrame with the season stats
     season_stats_df = pd.DataFrame({
         'Metric': ['Games Played', 'Goals', 'Assists', 'Points', 'Shots', '+/-', 'PIM', 'Goals/Game'],
         'Value': [
             games_played,
-            season_goals,
-            season_assists,
-            season_goals + season_assists,
-            season_shots,
-            season_plus_minus,
-            season_pim,
+            season_totals['Goals'],
+            season_totals['Assists'],
+            season_totals['Points'],
+            season_totals['Shots'],
+            season_totals['+/-'],
+            season_totals['PIM'],
             f"{gpg:.2f}"
         ]
     })
@@ -268,64 +193,14 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
     st.subheader("Game Log")
     st.markdown('<div class="android-heading-fallback">Game Log</div>', unsafe_allow_html=True)
     
-    # Create game log dataframe
-    game_log = []
+    # Game log from the precomputed player-game aggregates
+    game_log_df = player_rows_df.merge(games_df[['GameID', 'Date', 'Opponent']], on='GameID')
     
-    for game_id in player_game_ids:
-        game_info = games_df[games_df['GameID'] == game_id]
-        if game_info.empty:
-            continue
-            
-        game_date = game_info.iloc[0].get('Date', 'Unknown')
-        opponent = game_info.iloc[0].get('Opponent', 'Unknown')
-        
-        # Get events for this game
-        game_events = events_df[events_df['GameID'] == game_id]
-        player_game_events = game_events[game_events['PrimaryPlayerID'] == selected_player_id]
-        
-        # Calculate stats
-        goals = player_game_events['IsGoal'].sum() if 'IsGoal' in player_game_events.columns else 0
-        
-        # Calculate assists
-        assists = 0
-        for _, event in game_events[game_events['IsGoal'] == True].iterrows():
-            if event.get('AssistPlayer1ID') == selected_player_id or event.get('AssistPlayer2ID') == selected_player_id:
-                assists += 1
-        
-        # Calculate plus/minus
-        plus_minus = 0
-        if 'YourTeamPlayersOnIce' in game_events.columns:
-            for _, event in game_events[game_events['IsGoal'] == True].iterrows():
-                if pd.notna(event.get('YourTeamPlayersOnIce')):
-                    # More robust parsing of YourTeamPlayersOnIce field
-                    raw_players = str(event.get('YourTeamPlayersOnIce', ''))
-                    players_on_ice_raw = raw_players.split(',')
-                    players_on_ice = []
-                    for p in players_on_ice_raw:
-                        p_clean = p.strip().replace('player_', '')
-                        players_on_ice.append(p_clean)
-                    
-                    if selected_player_id in players_on_ice:
-                        if event.get('Team') == 'your_team':  # Adjust based on your team ID
-                            plus_minus += 1
-                        else:
-                            plus_minus -= 1
-        
-        # Add to game log
-        game_log.append({
-            'Date': game_date,
-            'Opponent': opponent,
-            'Goals': goals,
-            'Assists': assists,
-            'Points': goals + assists,
-            '+/-': plus_minus
-        })
-    
-    # Create dataframe and display
-    if game_log:
-        game_log_df = pd.DataFrame(game_log)
-        st.dataframe(
-            game_log_df,
+    # Most recent games first, one page at a time
+    if not game_log_df.empty:
+        render_paged_dataframe(
+            order_by_date(game_log_df, game_index_df, ascending=False)[['Date', 'Opponent', 'Goals', 'Assists', 'Points', '+/-']],
+            key="player_game_log",
             column_config={
                 'Date': st.column_config.TextColumn('Date'),
                 'Opponent': st.column_config.TextColumn('Opponent'),
@@ -333,9 +208,93 @@ def player_stats_view(players_df, games_df, events_df, game_roster_df):
                 'Assists': st.column_config.NumberColumn('Assists'),
                 'Points': st.column_config.NumberColumn('Points'),
                 '+/-': st.column_config.NumberColumn('+/-')
-            },
-            use_container_width=True,
-            hide_index=True
+            }
         )
     else:
         st.info("No game log data available for this player.")
+    
+    # Form over the season, from the cached rolling and cumulative series
+    st.markdown("---")
+    # Use both native Streamlit heading and a custom div for Android compatibility
+    st.subheader("Form")
+    st.markdown('<div class="android-heading-fallback">Form</div>', unsafe_allow_html=True)
+    
+    trend_window = st.select_slider("Rolling Window (games)", options=TREND_WINDOWS, value=5, key="player_trend_window")
+    player_trends_df = get_player_trends(events_df, game_roster_df, games_df, trend_window)
+    player_trend = player_trends_df[player_trends_df['PlayerID'] == selected_player_id]
+    
+    if not player_trend.empty:
+        chart_df = downsample(player_trend).set_index('GameNumber')
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.caption(f"Per game over the last {trend_window} games")
+            st.line_chart(chart_df[['RollingPoints', 'RollingGoals']].rename(columns={'RollingPoints': 'Points', 'RollingGoals': 'Goals'}))
+        
+        with col2:
+            st.caption("Season totals")
+            st.line_chart(chart_df[['CumGoals', 'CumPoints', 'CumPlusMinus']].rename(columns={'CumGoals': 'Goals', 'CumPoints': 'Points', 'CumPlusMinus': '+/-'}))
+    else:
+        st.info("No games played yet for a trend.")
+    
+    # Nearest players by per-game rates, from the cached feature matrix
+    st.markdown("---")
+    # Use both native Streamlit heading and a custom div for Android compatibility
+    st.subheader("Plays Like")
+    st.markdown('<div class="android-heading-fallback">Plays Like</div>', unsafe_allow_html=True)
+    
+    same_position = st.checkbox("Same position only", value=True, key="similar_same_position")
+    player_rates_df = get_player_rates(players_df, events_df, game_roster_df)
+    similar_df = similar_players(
+        get_feature_matrix(players_df, events_df, game_roster_df),
+        player_rates_df,
+        selected_player_id,
+        limit=5,
+        position=selected_player.get('Position') if same_position else None
+    )
+    
+    if not similar_df.empty:
+        st.caption("Closest matches on goals, assists, shots, PIM, +/- and special teams goals per game, scaled across the roster.")
+        st.dataframe(
+            similar_df[['JerseyNumber', 'FirstName', 'LastName', 'Position', 'GP', 'Similarity', 'Goals/GP', 'Assists/GP', 'Shots/GP', 'PIM/GP']],
+            column_config={
+                'JerseyNumber': st.column_config.TextColumn('#'),
+                'FirstName': st.column_config.TextColumn('First'),
+                'LastName': st.column_config.TextColumn('Last'),
+                'Position': st.column_config.TextColumn('Pos'),
+                'GP': st.column_config.NumberColumn('GP'),
+                'Similarity': st.column_config.NumberColumn('Similarity', format="%.0f%%"),
+                'Goals/GP': st.column_config.NumberColumn('G/GP', format="%.2f"),
+                'Assists/GP': st.column_config.NumberColumn('A/GP', format="%.2f"),
+                'Shots/GP': st.column_config.NumberColumn('Shots/GP', format="%.2f"),
+                'PIM/GP': st.column_config.NumberColumn('PIM/GP', format="%.2f")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info("No similar players found yet.")
+    
+    # Past seasons from the archive, looked up only once a season has been frozen
+    career_df = get_career_player_stats(archive_key) if archive_key else pd.DataFrame(columns=['PlayerID'])
+    career_df = career_df[career_df['PlayerID'] == selected_player_id]
+    if not career_df.empty:
+        st.markdown("---")
+        # Use both native Streamlit heading and a custom div for Android compatibility
+        st.subheader("Past Seasons")
+        st.markdown('<div class="android-heading-fallback">Past Seasons</div>', unsafe_allow_html=True)
+        
+        st.dataframe(
+            career_df.sort_values(by='Season', ascending=False)[['Season', 'GP', 'Goals', 'Assists', 'Points', '+/-', 'Shots']],
+            column_config={
+                'Season': st.column_config.TextColumn('Season'),
+                'GP': st.column_config.NumberColumn('GP'),
+                'Goals': st.column_config.NumberColumn('Goals'),
+                'Assists': st.column_config.NumberColumn('Assists'),
+                'Points': st.column_config.NumberColumn('Points'),
+                '+/-': st.column_config.NumberColumn('+/-'),
+                'Shots': st.column_config.NumberColumn('Shots')
+            },
+            hide_index=True,
+            use_container_width=True
+        )
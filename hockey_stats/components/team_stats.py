@@ -1,6 +1,17 @@
 import streamlit as st
 import pandas as pd
-from hockey_stats.utils import display_metric, calculate_team_stats, get_top_players
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.utils import display_metric, calculate_team_stats, get_top_players, render_breakdown_table, render_paged_dataframe
+from hockey_stats.aggregates import get_season_player_stats, jersey_lookup
+from hockey_stats.appearances import get_goalie_stats
+from hockey_stats.breakdowns import GAME_STATES, get_player_breakdowns, get_team_breakdowns, summarize_breakdowns
+from hockey_stats.dates import get_game_index, order_by_date
+from hockey_stats.lines import LINE_SIZES, get_line_combinations
+from hockey_stats.opponents import get_opponent_splits
+from hockey_stats.projections import get_player_projection, get_team_projection, unplayed_games
+from hockey_stats.shots import MIN_LEADERBOARD_SHOTS, get_season_shot_metrics, get_team_shot_metrics, shot_leaders
+from hockey_stats.trends import TREND_WINDOWS, downsample, get_team_trends
+from hockey_stats.windows import FULL_SEASON
 
 def team_stats_view(players_df, games_df, events_df, game_roster_df):
     """
@@ -32,16 +43,26 @@ def team_stats_view(players_df, games_df, events_df, game_roster_df):
     win_pct = team_stats['wins'] / (team_stats['wins'] + team_stats['losses'] + team_stats['ties']) * 100 if (team_stats['wins'] + team_stats['losses'] + team_stats['ties']) > 0 else 0
     goal_diff = team_stats['goals_for'] - team_stats['goals_against']
     
+    # Shots for and against per game, from the cached per-game shot metrics
+    team_shots_df = get_team_shot_metrics(events_df)
+    shot_games = max(len(team_shots_df), 1)
+    shots_for, shots_against = team_shots_df['SF'].sum(), team_shots_df['SA'].sum()
+    shot_share = shots_for / (shots_for + shots_against) * 100 if shots_for + shots_against > 0 else 0
+    
     # Create a DataFrame with the stats
     stats_df = pd.DataFrame({
-        'Metric': ['Record', 'Points', 'Goals For', 'Goals Against', 'Goal Differential', 'Win %'],
+        'Metric': ['Record', 'Points', 'Goals For', 'Goals Against', 'Goal Differential', 'Win %',
+                   'Shots For/GP', 'Shots Against/GP', 'Shot Share'],
         'Value': [
             f"{team_stats['wins']}-{team_stats['losses']}-{team_stats['ties']}",
             team_stats['points'],
             team_stats['goals_for'],
             team_stats['goals_against'],
             goal_diff,
-            f"{win_pct:.1f}%"
+            f"{win_pct:.1f}%",
+            f"{shots_for / shot_games:.1f}",
+            f"{shots_against / shot_games:.1f}",
+            f"{shot_share:.1f}%"
         ]
     })
 
@@ -56,69 +77,8 @@ def team_stats_view(players_df, games_df, events_df, game_roster_df):
         use_container_width=True
     )
     
-    # Calculate player season stats
-    player_stats = []
-    
-    for _, player in players_df.iterrows():
-        player_id = str(player.get('ID', ''))
-        player_events = events_df[events_df['PrimaryPlayerID'] == player_id]
-        
-        # Calculate games played from GameRoster
-        games_played = 0
-        if not game_roster_df.empty:
-            player_games = game_roster_df[(game_roster_df['PlayerID'] == player_id) & 
-                                          (game_roster_df['Status'] == 'Present')]
-            games_played = len(player_games)
-        
-        # Goals
-        goals = player_events['IsGoal'].sum() if 'IsGoal' in player_events.columns else 0
-        
-        # Assists
-        assists = 0
-        for _, event in events_df[events_df['IsGoal'] == True].iterrows():
-            if event.get('AssistPlayer1ID') == player_id or event.get('AssistPlayer2ID') == player_id:
-                assists += 1
-        
-        # Plus/minus
-        plus_minus = 0
-        if 'YourTeamPlayersOnIce' in events_df.columns:
-            for _, event in events_df[events_df['IsGoal'] == True].iterrows():
-                if pd.notna(event.get('YourTeamPlayersOnIce')):
-                    # More robust parsing of YourTeamPlayersOnIce field
-                    raw_players = str(event.get('YourTeamPlayersOnIce', ''))
-                    players_on_ice_raw = raw_players.split(',')
-                    players_on_ice = []
-                    for p in players_on_ice_raw:
-                        p_clean = p.strip().replace('player_', '')
-                        players_on_ice.append(p_clean)
-                    
-                    if player_id in players_on_ice:
-                        if event.get('Team') == 'your_team':  # Adjust based on your team ID
-                            plus_minus += 1
-                        else:
-                            plus_minus -= 1
-        
-        # Shots
-        shots = len(player_events[player_events['EventType'] == 'Shot']) if 'EventType' in player_events.columns else 0
-        
-        # Add to player stats
-        jersey = player.get('JerseyNumber', '')
-        player_stats.append({
-            'PlayerID': player_id,
-            'FirstName': player.get('FirstName', 'Player'),
-            'LastName': player.get('LastName', f"#{jersey}"),
-            'JerseyNumber': jersey,
-            'Position': player.get('Position', ''),
-            'GP': games_played,
-            'Goals': goals,
-            'Assists': assists,
-            'Points': goals + assists,
-            '+/-': plus_minus,
-            'Shots': shots
-        })
-    
-    # Create dataframe
-    player_stats_df = pd.DataFrame(player_stats)
+    # Season player stats, cached per data version
+    player_stats_df = get_season_player_stats(players_df, events_df, game_roster_df)
     
     # Display leaderboards
     st.markdown("---")
@@ -303,93 +263,101 @@ def team_stats_view(players_df, games_df, events_df, game_roster_df):
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
     
-    # Goalie Leaderboards - Wrap in collapsible section for mobile
+    # Shooting Leaderboards - Wrap in collapsible section for mobile
     st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
     st.markdown('<div class="collapsible-header">', unsafe_allow_html=True)
-    st.markdown("### Goalie Statistics")
-    st.markdown('<div class="android-heading-fallback">Goalie Statistics</div>', unsafe_allow_html=True)
+    st.markdown("### Shooting Leaderboards")
+    st.markdown('<div class="android-heading-fallback">Shooting Leaderboards</div>', unsafe_allow_html=True)
     st.markdown('<span class="collapsible-arrow">▼</span>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('<div class="collapsible-content">', unsafe_allow_html=True)
     
-    # Check if we have goalies
-    goalies_df = player_stats_df[player_stats_df['Position'] == 'G'].copy() if not player_stats_df.empty else pd.DataFrame()
+    # Season shooting lines, cached per data version alongside the other aggregates
+    season_shots_df = get_season_shot_metrics(players_df, events_df, game_roster_df)
+    skater_shots_df = season_shots_df[season_shots_df['Position'].isin(['F', 'D'])]
     
-    if not goalies_df.empty:
-        # For goalies, we need to calculate additional stats
-        goalie_stats = []
+    if not skater_shots_df.empty and skater_shots_df['SOG'].any():
+        shot_config = {
+            'JerseyNumber': st.column_config.TextColumn('#'),
+            'FirstName': st.column_config.TextColumn('First'),
+            'LastName': st.column_config.TextColumn('Last'),
+            'GP': st.column_config.NumberColumn('GP'),
+            'SOG': st.column_config.NumberColumn('SOG'),
+            'Goals': st.column_config.NumberColumn('Goals'),
+            'Shooting %': st.column_config.NumberColumn('Sh%', format="%.1f%%"),
+            'SOG/GP': st.column_config.NumberColumn('SOG/GP', format="%.2f"),
+            'OnIceSF': st.column_config.NumberColumn('On-Ice SF'),
+            'OnIceSA': st.column_config.NumberColumn('On-Ice SA'),
+            'SF%': st.column_config.NumberColumn('SF%', format="%.1f%%")
+        }
+        col1, col2 = st.columns(2)
         
-        for _, goalie in goalies_df.iterrows():
-            goalie_id = goalie['PlayerID']
-            
-            # Calculate games played
-            games_played = 0
-            goals_against = 0
-            shots_faced = 0
-            wins = 0
-            shutouts = 0
-            
-            # Process each game
-            for game_id in games_df['GameID'].unique():
-                game_events = events_df[events_df['GameID'] == game_id]
-                
-                # Check if goalie played in this game
-                if goalie_id in game_events['PrimaryPlayerID'].values:
-                    games_played += 1
-                    
-                    # Calculate goals against
-                    goals_against_game = len(game_events[(game_events['IsGoal'] == True) & 
-                                                       (game_events['Team'] != 'your_team')])
-                    goals_against += goals_against_game
-                    
-                    # Calculate shots faced
-                    shots_faced_game = len(game_events[(game_events['EventType'].isin(['Shot', 'Goal'])) & 
-                                                     (game_events['Team'] != 'your_team')])
-                    shots_faced += shots_faced_game
-                    
-                    # Check if win
-                    game_info = games_df[games_df['GameID'] == game_id]
-                    if not game_info.empty and game_info.iloc[0].get('Result') == 'W':
-                        wins += 1
-                    
-                    # Check if shutout
-                    if goals_against_game == 0:
-                        shutouts += 1
-            
-            # Calculate GAA and save percentage
-            gaa = goals_against / games_played if games_played > 0 else 0
-            save_pct = (shots_faced - goals_against) / shots_faced if shots_faced > 0 else 0
-            
-            goalie_stats.append({
-                'JerseyNumber': goalie['JerseyNumber'],
-                'FirstName': goalie['FirstName'],
-                'LastName': goalie['LastName'],
-                'GP': games_played,
-                'GAA': gaa,
-                'SV%': save_pct,
-                'W': wins,
-                'SO': shutouts
-            })
+        with col1:
+            st.markdown("#### Top 5 Shooting %")
+            top_shooting = shot_leaders(skater_shots_df, 'Shooting %')
+            if not top_shooting.empty:
+                st.dataframe(
+                    top_shooting[['JerseyNumber', 'FirstName', 'LastName', 'SOG', 'Goals', 'Shooting %']],
+                    column_config=shot_config,
+                    hide_index=True
+                )
+            else:
+                st.info(f"No skaters with {MIN_LEADERBOARD_SHOTS} or more shots on goal yet.")
         
-        # Create dataframe and display
-        if goalie_stats:
-            goalie_stats_df = pd.DataFrame(goalie_stats)
+        with col2:
+            st.markdown("#### Top 5 Shots per Game")
+            top_volume = shot_leaders(skater_shots_df, 'SOG/GP')
             st.dataframe(
-                goalie_stats_df,
-                column_config={
-                    'JerseyNumber': st.column_config.TextColumn('#'),
-                    'FirstName': st.column_config.TextColumn('First'),
-                    'LastName': st.column_config.TextColumn('Last'),
-                    'GP': st.column_config.NumberColumn('Games'),
-                    'GAA': st.column_config.NumberColumn('GAA', format="%.2f"),
-                    'SV%': st.column_config.NumberColumn('Save %', format="%.3f"),
-                    'W': st.column_config.NumberColumn('Wins'),
-                    'SO': st.column_config.NumberColumn('Shutouts')
-                },
+                top_volume[['JerseyNumber', 'FirstName', 'LastName', 'GP', 'SOG', 'SOG/GP']],
+                column_config=shot_config,
+                hide_index=True
+            )
+        
+        st.markdown("#### Top 5 On-Ice Shot Share")
+        top_share = shot_leaders(skater_shots_df, 'SF%')
+        if not top_share.empty:
+            st.dataframe(
+                top_share[['JerseyNumber', 'FirstName', 'LastName', 'GP', 'OnIceSF', 'OnIceSA', 'SF%']],
+                column_config=shot_config,
                 hide_index=True
             )
         else:
-            st.info("No goalie statistics available.")
+            st.info("Not enough on-ice data for shot share yet.")
+    else:
+        st.info("No shot data available.")
+    
+    # Close the shooting leaderboards collapsible section
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Goalie Leaderboards - Wrap in collapsible section for mobile
+    st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-header">', unsafe_allow_html=True)
+    st.markdown("### Goalie Statistics")
+    st.markdown('<div class="android-heading-fallback">Goalie Statistics</div>', unsafe_allow_html=True)
+    st.markdown('<span class="collapsible-arrow">▼</span>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-content">', unsafe_allow_html=True)
+    
+    # Goalie games come from the roster's appearance matrix, cached per data version
+    goalie_stats_df = get_goalie_stats(players_df, games_df, events_df, game_roster_df)
+    
+    if not goalie_stats_df.empty:
+        # Display goalie table
+        st.dataframe(
+            goalie_stats_df[['JerseyNumber', 'FirstName', 'LastName', 'GP', 'GAA', 'SV%', 'W', 'SO']],
+            column_config={
+                'JerseyNumber': st.column_config.TextColumn('#'),
+                'FirstName': st.column_config.TextColumn('First'),
+                'LastName': st.column_config.TextColumn('Last'),
+                'GP': st.column_config.NumberColumn('Games'),
+                'GAA': st.column_config.NumberColumn('GAA', format="%.2f"),
+                'SV%': st.column_config.NumberColumn('Save %', format="%.3f"),
+                'W': st.column_config.NumberColumn('Wins'),
+                'SO': st.column_config.NumberColumn('Shutouts')
+            },
+            hide_index=True
+        )
     else:
         st.info("No goalie data available.")
     
@@ -397,6 +365,51 @@ def team_stats_view(players_df, games_df, events_df, game_roster_df):
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
     
+    # Best Lines - Wrap in collapsible section for mobile
+    st.markdown("---")
+    st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-header">', unsafe_allow_html=True)
+    st.markdown("## Best Lines")
+    st.markdown('<div class="android-heading-fallback">Best Lines</div>', unsafe_allow_html=True)
+    st.markdown('<span class="collapsible-arrow">▼</span>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-content">', unsafe_allow_html=True)
+    
+    lines_df = get_line_combinations(events_df, players_df)
+    
+    if not lines_df.empty:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            line_size = st.selectbox("Line Size", options=list(LINE_SIZES.values()))
+        
+        with col2:
+            sort_by = st.selectbox("Sort By", options=['+/-', 'GF', 'GF%', 'GA'])
+        
+        # Fewest goals against is best when sorting by GA
+        sorted_lines = lines_df[lines_df['Size'] == line_size].sort_values(
+            by=[sort_by, 'GF'], ascending=[sort_by == 'GA', False]
+        )
+        
+        st.dataframe(
+            sorted_lines[['Line', 'GF', 'GA', '+/-', 'GF%']],
+            column_config={
+                'Line': st.column_config.TextColumn('Line'),
+                'GF': st.column_config.NumberColumn('GF'),
+                'GA': st.column_config.NumberColumn('GA'),
+                '+/-': st.column_config.NumberColumn('+/-'),
+                'GF%': st.column_config.NumberColumn('GF%', format="%.1f%%")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info("No on-ice data available for line combinations.")
+    
+    # Close the best lines collapsible section
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
     # Game Log - Wrap in collapsible section for mobile
     st.markdown("---")
     st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
@@ -410,24 +423,217 @@ def team_stats_view(players_df, games_df, events_df, game_roster_df):
     # Create game log
     if not games_df.empty:
         # Sort games by date (most recent first)
-        sorted_games = games_df.sort_values(by='Date', ascending=False)
+        sorted_games = order_by_date(games_df, get_game_index(games_df), ascending=False)
         
-        # Display game log
-        st.dataframe(
+        # Display game log one page at a time
+        render_paged_dataframe(
             sorted_games[['Date', 'Opponent', 'Result', 'GoalsFor', 'GoalsAgainst']],
+            key="team_game_log",
             column_config={
                 'Date': st.column_config.TextColumn('Date'),
                 'Opponent': st.column_config.TextColumn('Opponent'),
                 'Result': st.column_config.TextColumn('Result'),
                 'GoalsFor': st.column_config.NumberColumn('GF'),
                 'GoalsAgainst': st.column_config.NumberColumn('GA')
+            }
+        )
+    else:
+        st.info("No game log data available.")
+    
+    # Close the game log collapsible section
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Team Trends - Wrap in collapsible section for mobile
+    st.markdown("---")
+    st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-header">', unsafe_allow_html=True)
+    st.markdown("## Team Trends")
+    st.markdown('<div class="android-heading-fallback">Team Trends</div>', unsafe_allow_html=True)
+    st.markdown('<span class="collapsible-arrow">▼</span>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-content">', unsafe_allow_html=True)
+    
+    trend_window = st.select_slider("Rolling Window (games)", options=TREND_WINDOWS, value=5, key="team_trend_window")
+    team_trends_df = get_team_trends(games_df, events_df, trend_window)
+    
+    if not team_trends_df.empty:
+        chart_df = downsample(team_trends_df).set_index('GameNumber')
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.caption(f"Goals per game over the last {trend_window} games")
+            st.line_chart(chart_df[['RollingGF', 'RollingGA']].rename(columns={'RollingGF': 'GF', 'RollingGA': 'GA'}))
+        
+        with col2:
+            st.caption("Season totals")
+            st.line_chart(chart_df[['CumGoalDiff', 'CumPoints']].rename(columns={'CumGoalDiff': 'Goal Differential', 'CumPoints': 'Points'}))
+    else:
+        st.info("No games available for trends.")
+    
+    # Close the team trends collapsible section
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Period and game state splits - Wrap in collapsible section for mobile
+    st.markdown("---")
+    st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-header">', unsafe_allow_html=True)
+    st.markdown("## Period & Game State Splits")
+    st.markdown('<div class="android-heading-fallback">Period & Game State Splits</div>', unsafe_allow_html=True)
+    st.markdown('<span class="collapsible-arrow">▼</span>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-content">', unsafe_allow_html=True)
+    
+    team_breakdowns_df = get_team_breakdowns(events_df)
+    
+    if not team_breakdowns_df.empty:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            render_breakdown_table(summarize_breakdowns(team_breakdowns_df, 'Period'), "Period")
+        
+        with col2:
+            render_breakdown_table(summarize_breakdowns(team_breakdowns_df, 'State'), "Game State")
+        
+        # Each player's scoring when leading, tied or trailing
+        player_states_df = summarize_breakdowns(get_player_breakdowns(events_df), 'State', by=['PlayerID'])
+        player_states_df = player_states_df[player_states_df['PlayerID'].isin(players_df.loc[players_df['TeamID'] == OUR_TEAM_ID, 'ID'])]
+        
+        if not player_states_df.empty:
+            st.markdown("### Player Points by Game State")
+            st.markdown('<div class="android-heading-fallback">Player Points by Game State</div>', unsafe_allow_html=True)
+            
+            points_by_state = player_states_df.pivot(index='PlayerID', columns='Segment', values='Points')
+            points_by_state = points_by_state.reindex(columns=GAME_STATES).fillna(0).astype(int)
+            points_by_state['Player'] = points_by_state.index.map(jersey_lookup(players_df)).map(lambda jersey: f"#{jersey}")
+            
+            st.dataframe(
+                points_by_state.sort_values(by=GAME_STATES, ascending=False)[['Player'] + GAME_STATES],
+                column_config={
+                    'Player': st.column_config.TextColumn('Player'),
+                    'Leading': st.column_config.NumberColumn('Leading'),
+                    'Tied': st.column_config.NumberColumn('Tied'),
+                    'Trailing': st.column_config.NumberColumn('Trailing')
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+    else:
+        st.info("No period or game state data available.")
+    
+    # Close the period and game state collapsible section
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Opponent Splits - Wrap in collapsible section for mobile
+    st.markdown("---")
+    st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-header">', unsafe_allow_html=True)
+    st.markdown("## Opponent Splits")
+    st.markdown('<div class="android-heading-fallback">Opponent Splits</div>', unsafe_allow_html=True)
+    st.markdown('<span class="collapsible-arrow">▼</span>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-content">', unsafe_allow_html=True)
+    
+    opponent_splits_df = get_opponent_splits(games_df, events_df, players_df, game_roster_df)
+    
+    if not opponent_splits_df.empty:
+        st.dataframe(
+            opponent_splits_df,
+            column_config={
+                'Opponent': st.column_config.TextColumn('Opponent'),
+                'GP': st.column_config.NumberColumn('GP'),
+                'W': st.column_config.NumberColumn('W'),
+                'L': st.column_config.NumberColumn('L'),
+                'T': st.column_config.NumberColumn('T'),
+                'GF': st.column_config.NumberColumn('GF'),
+                'GA': st.column_config.NumberColumn('GA'),
+                'Diff': st.column_config.NumberColumn('Diff'),
+                'PPG': st.column_config.NumberColumn('PPG'),
+                'PPO': st.column_config.NumberColumn('PPO'),
+                'PP%': st.column_config.NumberColumn('PP%', format="%.1f%%"),
+                'PPGA': st.column_config.NumberColumn('PPGA'),
+                'SHG': st.column_config.NumberColumn('SHG'),
+                'PIM': st.column_config.NumberColumn('PIM'),
+                'Top Scorer': st.column_config.TextColumn('Top Scorer')
             },
             hide_index=True,
             use_container_width=True
         )
     else:
-        st.info("No game log data available.")
+        st.info("No opponent data available.")
     
-    # Close the game log collapsible section
+    # Close the opponent splits collapsible section
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Season Projection - Wrap in collapsible section for mobile
+    st.markdown("---")
+    st.markdown('<div class="collapsible-section">', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-header">', unsafe_allow_html=True)
+    st.markdown("## Season Projection")
+    st.markdown('<div class="android-heading-fallback">Season Projection</div>', unsafe_allow_html=True)
+    st.markdown('<span class="collapsible-arrow">▼</span>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div class="collapsible-content">', unsafe_allow_html=True)
+    
+    # The projection runs from the whole season's rates and games left, which a window would cut short
+    if st.session_state.get("game_window", FULL_SEASON) != FULL_SEASON:
+        st.info("The projection uses the full season. Set Games to Full season to see it.")
+    else:
+        # Defaults to the scheduled games without events; coaches can project further ahead
+        games_left = st.number_input(
+            "Games Left",
+            min_value=0,
+            max_value=100,
+            value=min(unplayed_games(games_df, events_df), 100),
+            key="projection_games_left"
+        )
+    
+        team_projection_df = get_team_projection(games_df, events_df, int(games_left))
+    
+        if not team_projection_df.empty and games_left > 0:
+            st.caption("Low, median and high outcomes (10th, 50th and 90th percentiles) of simulated seasons at the current per-game rates.")
+            st.dataframe(
+                team_projection_df,
+                column_config={
+                    'Stat': st.column_config.TextColumn('Stat'),
+                    'Current': st.column_config.NumberColumn('Now'),
+                    'P10': st.column_config.NumberColumn('Low'),
+                    'P50': st.column_config.NumberColumn('Median'),
+                    'P90': st.column_config.NumberColumn('High')
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+        
+            player_projection_df = get_player_projection(players_df, games_df, events_df, game_roster_df, int(games_left))
+            st.markdown("### Player Scoring Pace")
+            st.markdown('<div class="android-heading-fallback">Player Scoring Pace</div>', unsafe_allow_html=True)
+            st.dataframe(
+                player_projection_df[player_projection_df['Position'] != 'G'][
+                    ['JerseyNumber', 'FirstName', 'LastName', 'GP', 'Points', 'Goals P50', 'Points P10', 'Points P50', 'Points P90']
+                ],
+                column_config={
+                    'JerseyNumber': st.column_config.TextColumn('#'),
+                    'FirstName': st.column_config.TextColumn('First'),
+                    'LastName': st.column_config.TextColumn('Last'),
+                    'GP': st.column_config.NumberColumn('GP'),
+                    'Points': st.column_config.NumberColumn('Points'),
+                    'Goals P50': st.column_config.NumberColumn('Proj. Goals'),
+                    'Points P10': st.column_config.NumberColumn('Proj. Points Low'),
+                    'Points P50': st.column_config.NumberColumn('Proj. Points'),
+                    'Points P90': st.column_config.NumberColumn('Proj. Points High')
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+        elif team_projection_df.empty:
+            st.info("No games played yet to project from.")
+        else:
+            st.info("Set the number of games left to project the season.")
+    
+    # Close the season projection collapsible section
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
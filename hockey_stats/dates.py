@@ -0,0 +1,72 @@
+import pandas as pd
+
+from hockey_stats.normalize import parse_dates
+from hockey_stats.shared import shared_frame
+
+GAME_INDEX_COLUMNS = ['GameID', 'Date', 'Opponent', 'Label', 'Order']
+
+def game_dates(games_df):
+    """Parsed game dates, from the GameDate column added at load or parsed here for older frames"""
+    if 'GameDate' in games_df.columns:
+        return pd.to_datetime(games_df['GameDate'])
+    return parse_dates(games_df['Date'])
+
+def calculate_game_index(games_df):
+    """Games in date order, indexed by their parsed date
+
+    Games whose date could not be parsed come last, in sheet order. `Order`
+    is each game's position, so any list of game IDs can be put in date
+    order with a lookup.
+    """
+    if games_df.empty:
+        return pd.DataFrame(columns=GAME_INDEX_COLUMNS, index=pd.DatetimeIndex([], name='GameDate'))
+
+    index_df = games_df[['GameID', 'Date', 'Opponent']].assign(GameDate=game_dates(games_df))
+    index_df['Label'] = index_df['Date'].astype(str) + ' vs ' + index_df['Opponent'].astype(str)
+    index_df = index_df.sort_values(by=['GameDate', 'GameID'], kind='stable', na_position='last')
+    index_df['Order'] = range(len(index_df))
+    return index_df.set_index('GameDate')[GAME_INDEX_COLUMNS]
+
+def played_game_ids(games_df, events_df):
+    """Scheduled games that have events recorded, i.e. have been played"""
+    if games_df.empty or events_df.empty:
+        return pd.Index([])
+    return pd.Index(games_df['GameID'][games_df['GameID'].isin(events_df['GameID'])])
+
+def _dated(game_index_df):
+    """The games with a parsed date, still sorted"""
+    return game_index_df.iloc[:game_index_df.index.notna().sum()]
+
+def game_options(game_index_df, game_ids=None):
+    """(labels, game IDs) for a game selector, most recent first, optionally limited to `game_ids`"""
+    games = game_index_df if game_ids is None else game_index_df[game_index_df['GameID'].isin(game_ids)]
+    dated = _dated(games)
+    ordered = pd.concat([dated.iloc[::-1], games.iloc[len(dated):]])
+    return ordered['Label'].tolist(), ordered['GameID'].tolist()
+
+def last_n_games(game_index_df, n):
+    """IDs of the last `n` dated games"""
+    dated = _dated(game_index_df)
+    return dated['GameID'].iloc[max(len(dated) - n, 0):]
+
+def games_between(game_index_df, start=None, end=None):
+    """IDs of the games dated from `start` to `end`, both inclusive; either end may be open"""
+    dated = _dated(game_index_df)
+    first = dated.index.searchsorted(pd.Timestamp(start), side='left') if start is not None else 0
+    last = dated.index.searchsorted(pd.Timestamp(end), side='right') if end is not None else len(dated)
+    return dated['GameID'].iloc[first:last]
+
+def order_by_date(df, game_index_df, ascending=True):
+    """Rows of a frame with a GameID column, sorted by game date; undated games come last either way"""
+    dated_order = _dated(game_index_df).set_index('GameID')['Order']
+    order = df['GameID'].map(dated_order)
+    return (
+        df.assign(_order=order)
+        .sort_values(by='_order', ascending=ascending, kind='stable', na_position='last')
+        .drop(columns='_order')
+    )
+
+@shared_frame()
+def get_game_index(games_df):
+    """Cached date-sorted game index for the currently loaded season"""
+    return calculate_game_index(games_df)
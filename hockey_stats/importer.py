@@ -0,0 +1,132 @@
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from hockey_stats.normalize import normalize_frame, prepare_events, prepare_games
+
+IMPORT_SHEETS = ['Games', 'Events', 'GameRoster']
+
+# Columns that identify the same row entered twice; events have no ID of their own
+NATURAL_KEYS = {
+    'Games': ['GameID'],
+    'Events': ['GameID', 'Period', 'Time', 'EventType', 'Team', 'PrimaryPlayerID'],
+    'GameRoster': ['GameID', 'PlayerID'],
+}
+
+# Steps the sheet loaders take before normalizing, so imported rows get the same columns
+PREPARE = {'Games': prepare_games, 'Events': prepare_events}
+
+EXCEL_SUFFIXES = ('.xlsx', '.xlsm', '.xls')
+
+def read_import_file(path, sheet_name):
+    """Raw rows of a CSV or Excel score sheet, with every cell read as text
+
+    Workbooks are read from the tab named after the sheet, or from their
+    first tab. Excel files need openpyxl installed.
+    """
+    path = Path(path)
+    if path.suffix.lower() in EXCEL_SUFFIXES:
+        tabs = pd.read_excel(path, sheet_name=None, dtype=str)
+        return tabs.get(sheet_name, next(iter(tabs.values())))
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+def normalize_import(raw_df, sheet_name):
+    """Clean imported rows with the same rules the sheet loaders use"""
+    prepare = PREPARE.get(sheet_name)
+    if prepare:
+        raw_df = prepare(raw_df)
+    return normalize_frame(raw_df, sheet_name)
+
+def _key_index(df, sheet_name):
+    return pd.MultiIndex.from_frame(df.reindex(columns=NATURAL_KEYS[sheet_name], fill_value='').astype(str))
+
+def new_rows(import_df, existing_df, sheet_name):
+    """Imported rows not already in `existing_df` and not repeated earlier in the import
+
+    Rows are matched on the sheet's natural key. Returns the new rows and
+    the number skipped as duplicates.
+    """
+    if import_df.empty:
+        return import_df, 0
+    keys = _key_index(import_df, sheet_name)
+    duplicate = keys.duplicated()
+    if not existing_df.empty:
+        duplicate |= keys.isin(_key_index(existing_df, sheet_name))
+    return import_df[~duplicate].reset_index(drop=True), int(duplicate.sum())
+
+def sheet_values(rows_df, header):
+    """Rows as lists of text in the worksheet's column order, with booleans spelled Yes/No"""
+    values = rows_df.reindex(columns=header)
+    for col in values.columns:
+        if values[col].dtype == bool:
+            values[col] = values[col].map({True: 'Yes', False: 'No'})
+    return values.fillna('').astype(str).values.tolist()
+
+def _worksheet(sheet_name):
+    from hockey_stats.sheets_service import SPREADSHEET_KEY, connect_to_sheets
+    return connect_to_sheets().open_by_key(SPREADSHEET_KEY).worksheet(sheet_name)
+
+def read_sheet_rows(sheet_name):
+    """Rows already in the worksheet, normalized like the import"""
+    from hockey_stats.sheets_service import read_worksheet_records
+    return normalize_import(pd.DataFrame(read_worksheet_records(sheet_name)), sheet_name)
+
+def push_to_sheet(rows_df, sheet_name, columns):
+    """Append rows to the worksheet in one batched request
+
+    Rows are laid out by the worksheet's header row, or by `columns` with a
+    header added when the worksheet is empty. Games are written with their
+    GameID as the ID, since the loader reads one from the other. The append
+    is not retried, as a request that timed out may still have landed;
+    running the import again is safe because rows already in the sheet are
+    skipped.
+    """
+    worksheet = _worksheet(sheet_name)
+    header = worksheet.row_values(1)
+    if sheet_name == 'Games' and 'ID' in (header or columns):
+        rows_df = rows_df.assign(ID=rows_df['GameID'])
+    values = sheet_values(rows_df, header or columns)
+    if not header:
+        values = [list(columns)] + values
+    worksheet.append_rows(values, value_input_option='USER_ENTERED')
+
+def import_file(path, sheet_name, dry_run=False):
+    """Read, clean and de-duplicate one file against the sheet, then append its new rows
+
+    Returns a summary with the rows read, rows rejected by reason, duplicates
+    skipped and rows written.
+    """
+    if sheet_name not in IMPORT_SHEETS:
+        raise ValueError(f"Cannot import {sheet_name}; expected one of {', '.join(IMPORT_SHEETS)}")
+
+    raw_df = read_import_file(path, sheet_name)
+    import_df = normalize_import(raw_df, sheet_name)
+    rows_df, duplicates = new_rows(import_df, read_sheet_rows(sheet_name), sheet_name)
+
+    if not dry_run and not rows_df.empty:
+        push_to_sheet(rows_df, sheet_name, list(raw_df.columns))
+
+    return {
+        'read': len(raw_df),
+        'rejected': import_df.attrs.get('rejected', {}),
+        'duplicates': duplicates,
+        'written': 0 if dry_run else len(rows_df),
+    }
+
+def main():
+    """Command line entry point: python -m hockey_stats.importer events.csv --sheet Events"""
+    parser = argparse.ArgumentParser(description="Bulk import games, events or rosters from CSV or Excel into the Google Sheet")
+    parser.add_argument('paths', nargs='+', help="CSV or Excel files to import")
+    parser.add_argument('--sheet', required=True, choices=IMPORT_SHEETS, help="Sheet the rows belong to")
+    parser.add_argument('--dry-run', action='store_true', help="Check the files without writing anything")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        summary = import_file(path, args.sheet, args.dry_run)
+        print(f"{path}: read {summary['read']} rows, skipped {summary['duplicates']} duplicates, wrote {summary['written']}")
+        for reason, count in summary['rejected'].items():
+            print(f"  rejected {count} row(s) with {reason}")
+
+if __name__ == "__main__":
+    main()
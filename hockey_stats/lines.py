@@ -0,0 +1,98 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from hockey_stats.aggregates import explode_players_on_ice, jersey_lookup
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+# Line sizes reported by the line combination engine
+LINE_SIZES = {2: "Pairs", 3: "Trios", 5: "Five-Player Units"}
+
+LINE_COLUMNS = ['Size', 'PlayerIDs', 'Line', 'GF', 'GA', '+/-', 'GF%']
+
+def _combination_rows(code_matrix, size):
+    """Expand each row of sorted player codes into all of its `size`-player combinations"""
+    template = np.array(list(combinations(range(code_matrix.shape[1]), size)))
+    return code_matrix[:, template].reshape(-1, size), len(template)
+
+def calculate_line_combinations(events_df, players_df, our_team_id=OUR_TEAM_ID):
+    """Count goals for and against for every skater pair, trio and five-player unit
+
+    Each goal contributes one (combination, goal) entry per subset of the skaters
+    on the ice, which is a sparse co-occurrence of combinations and goals. The
+    entries are reduced with np.unique/np.bincount, so the work grows with the
+    number of goals rather than with every possible combination of the roster.
+    """
+    if events_df.empty or players_df.empty:
+        return pd.DataFrame(columns=LINE_COLUMNS)
+
+    # Skaters only - goalies are on the ice for every goal
+    skaters = players_df[players_df['Position'] != 'G']
+    skater_ids = pd.Index(skaters['ID'])
+    jerseys = jersey_lookup(skaters)
+
+    goals = events_df[events_df['IsGoal']]
+    on_ice = explode_players_on_ice(goals)
+    if on_ice.empty:
+        return pd.DataFrame(columns=LINE_COLUMNS)
+
+    # One (goal, skater code) row per skater on the ice, sorted so each goal's codes are contiguous
+    codes = skater_ids.get_indexer(on_ice.values)
+    memberships = pd.DataFrame({'goal': on_ice.index, 'code': codes})
+    memberships = memberships[memberships['code'] >= 0].drop_duplicates().sort_values(['goal', 'code'])
+    set_sizes = memberships.groupby('goal')['code'].transform('size')
+    is_for = goals['Team'] == our_team_id
+
+    combo_rows = {size: [] for size in LINE_SIZES}
+    combo_for = {size: [] for size in LINE_SIZES}
+
+    # Goals with the same number of skaters share one combination template
+    for set_size in np.unique(set_sizes):
+        same_size = memberships[set_sizes == set_size]
+        code_matrix = same_size['code'].to_numpy().reshape(-1, set_size)
+        goal_for = is_for.loc[same_size['goal'].to_numpy()[::set_size]].to_numpy()
+
+        for size in LINE_SIZES:
+            if size > set_size:
+                continue
+            rows, per_goal = _combination_rows(code_matrix, size)
+            combo_rows[size].append(rows)
+            combo_for[size].append(np.repeat(goal_for, per_goal))
+
+    results = []
+    for size, label in LINE_SIZES.items():
+        if not combo_rows[size]:
+            continue
+        rows = np.concatenate(combo_rows[size])
+        scored = np.concatenate(combo_for[size])
+
+        unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        gf = np.bincount(inverse, weights=scored, minlength=len(unique_rows)).astype(int)
+        ga = np.bincount(inverse, weights=~scored, minlength=len(unique_rows)).astype(int)
+
+        player_ids = skater_ids.to_numpy()[unique_rows]
+        line_labels = [' - '.join(f"#{jerseys.get(pid, '?')}" for pid in ids) for ids in player_ids]
+
+        results.append(pd.DataFrame({
+            'Size': label,
+            'PlayerIDs': [tuple(ids) for ids in player_ids],
+            'Line': line_labels,
+            'GF': gf,
+            'GA': ga,
+        }))
+
+    if not results:
+        return pd.DataFrame(columns=LINE_COLUMNS)
+
+    lines_df = pd.concat(results, ignore_index=True)
+    lines_df['+/-'] = lines_df['GF'] - lines_df['GA']
+    lines_df['GF%'] = lines_df['GF'] / (lines_df['GF'] + lines_df['GA']) * 100
+    return lines_df.sort_values(by=['+/-', 'GF'], ascending=False, ignore_index=True)[LINE_COLUMNS]
+
+@shared_frame()
+def get_line_combinations(events_df, players_df, our_team_id=OUR_TEAM_ID):
+    """Cached line combinations for the currently loaded events and players"""
+    return calculate_line_combinations(events_df, players_df, our_team_id)
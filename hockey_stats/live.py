@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from hockey_stats.aggregates import PLAYER_GAME_COLUMNS, calculate_player_game_stats, get_player_game_stats, shots_on_goal
+from hockey_stats.boxscores import calculate_player_box_scores, get_team_box_scores
+from hockey_stats.normalize import OUR_TEAM_ID, normalize_frame, prepare_events
+from hockey_stats.shared import MAX_ENTRIES
+from hockey_stats.sheets_service import read_worksheet_tail
+from hockey_stats.versioning import FRAME_HASH_FUNCS
+
+# Seconds between polls of the Events sheet, shared by every open session
+LIVE_POLL_SECONDS = 5
+
+PLAYER_GAME_KEYS = ['PlayerID', 'GameID']
+
+def apply_player_events(player_game_df, new_events_df, our_team_id=OUR_TEAM_ID):
+    """Player-game aggregates with new events added, aggregating only the new events
+
+    Every player-game figure is a sum over events, so the new events'
+    aggregates are simply added on. Roster presence is unchanged.
+    """
+    delta = calculate_player_game_stats(new_events_df, pd.DataFrame(), our_team_id).set_index(PLAYER_GAME_KEYS)
+    base = player_game_df.set_index(PLAYER_GAME_KEYS)
+    count_cols = [col for col in PLAYER_GAME_COLUMNS if col not in PLAYER_GAME_KEYS + ['Present']]
+    updated = base[count_cols].add(delta[count_cols], fill_value=0).astype(int)
+    updated['Present'] = base['Present'].reindex(updated.index, fill_value=False)
+    return updated.reset_index()[PLAYER_GAME_COLUMNS]
+
+def apply_team_events(team_box_df, new_events_df, our_team_id=OUR_TEAM_ID):
+    """Team box scores with new events added to the games they belong to
+
+    Counts are added on, then only the touched games get a fresh result and
+    power play percentage.
+    """
+    ours = new_events_df['Team'] == our_team_id
+    delta = pd.DataFrame({
+        'GoalsFor': new_events_df['IsGoal'] & ours,
+        'GoalsAgainst': new_events_df['IsGoal'] & ~ours,
+        'Shots': shots_on_goal(new_events_df),
+        'PIM': new_events_df['PenaltyDuration'],
+        'PPG': new_events_df['IsPowerPlay'],
+        'PPO': new_events_df['EventType'] == 'PowerPlay',
+    }).groupby(new_events_df['GameID']).sum().astype(int)
+    delta = delta[delta.index.isin(team_box_df.index)]
+    if delta.empty:
+        return team_box_df
+
+    box_df = team_box_df.copy()
+    games = delta.index
+    box_df.loc[games, delta.columns] = box_df.loc[games, delta.columns] + delta
+    goals_for, goals_against = box_df.loc[games, 'GoalsFor'], box_df.loc[games, 'GoalsAgainst']
+    box_df.loc[games, 'Result'] = 'T'
+    box_df.loc[games[goals_for > goals_against], 'Result'] = 'W'
+    box_df.loc[games[goals_for < goals_against], 'Result'] = 'L'
+    ppo = box_df.loc[games, 'PPO']
+    box_df.loc[games, 'PP%'] = (box_df.loc[games, 'PPG'] / ppo.where(ppo > 0) * 100).fillna(0)
+    return box_df
+
+class LiveFeed:
+    """Events appended to the sheet since the season was loaded, and the aggregates they update
+
+    One feed serves every session viewing the same data version. Polls are
+    rate-limited to one per `interval` for all of them, read only the rows
+    below the last one seen, and fold the new events into the player-game
+    aggregates and team box scores without recomputing the season. Edits to
+    rows already read show up with the next full reload.
+    """
+
+    def __init__(self, events_df, player_game_df, team_box_df, interval=LIVE_POLL_SECONDS, our_team_id=OUR_TEAM_ID):
+        self.base_events_df = events_df
+        self.player_game_df = player_game_df
+        self.team_box_df = team_box_df
+        self.new_events_df = events_df.iloc[0:0]
+        self.interval = interval
+        self.our_team_id = our_team_id
+        # Sheet row of the first row not yet read; row 1 is the header
+        self.next_row = events_df.attrs['sheet_rows'] + 2
+        self.polled_at = 0.0
+        self.updated_at = time.time()
+        self.error = None
+        self.lock = threading.Lock()
+
+    def poll(self):
+        """Read and apply any new rows, unless another session polled within the interval
+
+        Returns True when new events were applied.
+        """
+        with self.lock:
+            if time.monotonic() - self.polled_at < self.interval:
+                return False
+            self.polled_at = time.monotonic()
+            try:
+                header, rows = read_worksheet_tail('Events', self.next_row)
+            except Exception as e:
+                self.error = str(e)
+                return False
+            self.error = None
+            if not rows:
+                return False
+
+            raw_df = pd.DataFrame([row + [''] * (len(header) - len(row)) for row in rows], columns=header)
+            new_events_df = normalize_frame(prepare_events(raw_df), 'Events')
+            self.next_row += len(rows)
+            if new_events_df.empty:
+                return False
+
+            self.player_game_df = apply_player_events(self.player_game_df, new_events_df, self.our_team_id)
+            self.team_box_df = apply_team_events(self.team_box_df, new_events_df, self.our_team_id)
+            self.new_events_df = pd.concat([self.new_events_df, new_events_df], ignore_index=True)
+            self.updated_at = time.time()
+            return True
+
+    def game_box_score(self, players_df, games_df, game_roster_df, game_id):
+        """The game's team row and player lines, from the live aggregates for that game alone"""
+        with self.lock:
+            team_box_df, player_game_df, new_events_df = self.team_box_df, self.player_game_df, self.new_events_df
+        base_events_df = self.base_events_df
+        game_events_df = pd.concat([
+            base_events_df[base_events_df['GameID'] == game_id],
+            new_events_df[new_events_df['GameID'] == game_id],
+        ], ignore_index=True)
+        player_lines = calculate_player_box_scores(
+            players_df,
+            games_df[games_df['GameID'] == game_id],
+            player_game_df[player_game_df['GameID'] == game_id],
+            game_events_df,
+            game_roster_df[game_roster_df['GameID'] == game_id] if not game_roster_df.empty else game_roster_df,
+            self.our_team_id
+        )
+        return team_box_df.loc[game_id], player_lines.reset_index(drop=True)
+
+def live_available(events_df):
+    """Live mode needs events loaded from the sheet, not from the archive"""
+    return not events_df.empty and 'sheet_rows' in events_df.attrs
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=MAX_ENTRIES, hash_funcs=FRAME_HASH_FUNCS)
+def get_live_feed(games_df, events_df, game_roster_df):
+    """The process-wide live feed for a data version, started from its cached aggregates"""
+    return LiveFeed(
+        events_df,
+        get_player_game_stats(events_df, game_roster_df),
+        get_team_box_scores(games_df, events_df)
+    )
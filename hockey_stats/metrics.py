@@ -0,0 +1,230 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Serve /metrics on this port, or rewrite this file during reruns, when set
+METRICS_PORT_ENV = "HOCKEY_STATS_METRICS_PORT"
+METRICS_FILE_ENV = "HOCKEY_STATS_METRICS_FILE"
+
+# Least seconds between rewrites of the metrics file; textfile collectors are scraped about this often
+METRICS_FILE_INTERVAL = 15
+
+logger = logging.getLogger(__name__)
+
+# Seconds; a Sheets fetch can take tens of seconds when Google is slow
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """A named metric family with fixed label names, safe to update from any thread"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple((name, labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """(suffix, labels, value) for every series"""
+        with self.lock:
+            return [('', key, value) for key, value in sorted(self.values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_label_text(labels)} {_number(value)}")
+        return '\n'.join(lines)
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            counts, total = self.values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self.values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for key, (counts, total) in sorted(self.values.items()):
+                for bound, count in zip(self.buckets, counts):
+                    samples.append(('_bucket', key + (('le', _number(bound)),), count))
+                samples.append(('_sum', key, total))
+                samples.append(('_count', key, counts[-1]))
+        return samples
+
+REGISTRY = []
+
+SHEETS_FETCH_SECONDS = Histogram(
+    'hockey_stats_sheets_fetch_seconds', "Time to fetch all records of a worksheet, retries included", ['worksheet']
+)
+SHEETS_FETCH_ERRORS = Counter(
+    'hockey_stats_sheets_fetch_errors_total', "Worksheet fetches that failed after retries", ['worksheet']
+)
+SHEETS_ROWS = Gauge('hockey_stats_sheets_rows', "Records returned by the last fetch of a worksheet", ['worksheet'])
+SHEETS_LAST_FETCH = Gauge(
+    'hockey_stats_sheets_last_fetch_timestamp_seconds', "Unix time of the last successful fetch of a worksheet", ['worksheet']
+)
+DATA_AGE_SECONDS = Gauge(
+    'hockey_stats_data_age_seconds', "Seconds since the data sessions are served was fetched from a worksheet", ['worksheet']
+)
+CACHE_REQUESTS = Counter(
+    'hockey_stats_cache_requests_total', "Calls to a cached frame function, by hit or miss", ['function', 'result']
+)
+BUILD_SECONDS = Histogram(
+    'hockey_stats_build_seconds', "Time to build a cached frame on a cache miss", ['function']
+)
+RERUNS = Counter('hockey_stats_reruns_total', "Script reruns by view", ['view'])
+SCHEDULER_EVENTS = Counter(
+    'hockey_stats_sheets_scheduler_events_total', "Sheets scheduler requests, coalesced callers, retries and failures", ['event']
+)
+
+def record_fetch(worksheet, seconds, rows):
+    """Record a successful worksheet fetch"""
+    SHEETS_FETCH_SECONDS.observe(seconds, worksheet=worksheet)
+    SHEETS_ROWS.set(rows, worksheet=worksheet)
+    SHEETS_LAST_FETCH.set(time.time(), worksheet=worksheet)
+
+def _refresh_derived():
+    """Update the gauges worked out at scrape time: data age and the scheduler's counts"""
+    now = time.time()
+    with SHEETS_LAST_FETCH.lock:
+        fetched = dict(SHEETS_LAST_FETCH.values)
+    for key, timestamp in fetched.items():
+        DATA_AGE_SECONDS.set(now - timestamp, **dict(key))
+
+    from hockey_stats.scheduler import get_scheduler
+    scheduler = get_scheduler()
+    with scheduler.lock:
+        stats = dict(scheduler.stats)
+    # Mirrored from the scheduler's own running totals
+    with SCHEDULER_EVENTS.lock:
+        SCHEDULER_EVENTS.values = {(('event', event),): count for event, count in stats.items()}
+
+def render():
+    """Every metric in the Prometheus text exposition format"""
+    _refresh_derived()
+    return '\n'.join(metric.render() for metric in REGISTRY) + '\n'
+
+def write_metrics_file(path):
+    """Write the metrics to `path` atomically, e.g. for node_exporter's textfile collector"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+_failed_ports = set()
+_server_lock = threading.Lock()
+_file_written_at = None
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """Serve /metrics from a background thread; later calls reuse the running server
+
+    A port that could not be bound is logged once and not tried again.
+    """
+    global _server
+    with _server_lock:
+        if _server is None and (host, port) not in _failed_ports:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            except OSError as e:
+                # Another copy of this module (after a code reload) may still hold the port
+                _failed_ports.add((host, port))
+                logger.warning("Metrics server not started on port %s: %s", port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name='metrics', daemon=True).start()
+        return _server
+
+def export_from_env():
+    """Start the metrics server or rewrite the metrics file, as configured by the environment
+
+    The file is rewritten at most once every METRICS_FILE_INTERVAL seconds
+    however many sessions are rerunning.
+    """
+    global _file_written_at
+    port = os.environ.get(METRICS_PORT_ENV)
+    if port:
+        start_metrics_server(port)
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path:
+        with _server_lock:
+            now = time.monotonic()
+            if _file_written_at is not None and now - _file_written_at < METRICS_FILE_INTERVAL:
+                return
+            _file_written_at = now
+        write_metrics_file(path)
@@ -0,0 +1,215 @@
+import pandas as pd
+
+from hockey_stats.versioning import stamp_fingerprint
+
+# Team key used for our team in the Events and Players sheets
+OUR_TEAM_ID = "your_team"
+
+BOOLEAN_VALUES = {
+    'yes': True, 'true': True, '1': True, 'y': True,
+    'no': False, 'false': False, '0': False, 'n': False,
+    '': False
+}
+
+# Canonical spelling for each event type, keyed by its lowercase form
+EVENT_TYPES = {
+    'goal': 'Goal',
+    'shot': 'Shot',
+    'penalty': 'Penalty',
+    'powerplay': 'PowerPlay',
+    'hit': 'Hit',
+    'faceoff': 'Faceoff',
+}
+
+# Declarative cleaning rules for each worksheet. Every rule is applied to whole
+# columns at once; `defaults` fill in columns the sheet does not have,
+# `parsed_dates` adds a datetime column beside a date column, and rows that
+# fail `required` or `unique` are quarantined.
+SCHEMAS = {
+    'Games': {
+        'ids': ['ID', 'GameID'],
+        'dates': ['Date'],
+        'parsed_dates': {'Date': 'GameDate'},
+        'text': ['Opponent', 'Location'],
+        'defaults': {'Date': '', 'Opponent': ''},
+        'required': ['GameID'],
+        'unique': ['GameID'],
+    },
+    'Events': {
+        'ids': ['GameID', 'PrimaryPlayerID', 'AssistPlayer1ID', 'AssistPlayer2ID'],
+        'id_lists': ['YourTeamPlayersOnIce'],
+        'team_keys': ['Team'],
+        'booleans': ['IsGoal', 'IsPowerPlay', 'IsShortHanded'],
+        'numbers': ['PenaltyDuration'],
+        'choices': {'EventType': EVENT_TYPES},
+        'text': ['Period', 'Time', 'PenaltyType'],
+        'defaults': {
+            'EventType': '', 'Team': '', 'PrimaryPlayerID': '', 'AssistPlayer1ID': '', 'AssistPlayer2ID': '',
+            'YourTeamPlayersOnIce': '', 'IsGoal': False, 'IsPowerPlay': False, 'IsShortHanded': False,
+            'PenaltyDuration': 0,
+        },
+        'required': ['GameID'],
+    },
+    'GameRoster': {
+        'ids': ['GameID', 'PlayerID'],
+        'choices': {'Status': {'present': 'Present', 'absent': 'Absent'}},
+        'booleans': ['Starter'],
+        'defaults': {'Status': '', 'Starter': False},
+        'required': ['GameID', 'PlayerID'],
+        'unique': ['GameID', 'PlayerID'],
+    },
+    'Players': {
+        'ids': ['ID'],
+        'team_keys': ['TeamID'],
+        'upper': ['Position'],
+        'text': ['FirstName', 'LastName'],
+        'defaults': {'TeamID': '', 'Position': '', 'JerseyNumber': ''},
+        'required': ['ID'],
+        'unique': ['ID'],
+    },
+}
+
+def _clean_text(series):
+    """Strip whitespace and turn missing values into empty strings"""
+    text = series.fillna('').astype(str).str.strip()
+    if pd.api.types.is_float_dtype(series):
+        # Whole numbers read alongside blank cells arrive as floats, e.g. 2.0
+        text = text.str.replace(r'\.0$', '', regex=True)
+    return text.replace({'nan': '', 'None': ''})
+
+def clean_ids(series):
+    """Canonical ID form: plain strings without the 'player_' prefix"""
+    return _clean_text(series).str.replace('player_', '', regex=False)
+
+def clean_id_lists(series):
+    """Canonical comma-separated ID list, e.g. 'player_1, player_2' -> '1,2'"""
+    return (
+        _clean_text(series)
+        .str.replace('player_', '', regex=False)
+        .str.replace(r'\s*,\s*', ',', regex=True)
+        .str.strip(',')
+    )
+
+def clean_team_keys(series):
+    """Canonical team key: lowercase, no surrounding whitespace"""
+    return _clean_text(series).str.lower()
+
+def clean_booleans(series):
+    """Map the various yes/no spellings used in the sheets to booleans"""
+    if series.dtype == bool:
+        return series
+    return _clean_text(series).str.lower().map(BOOLEAN_VALUES).fillna(False).astype(bool)
+
+def clean_numbers(series):
+    """Numeric values with blanks as 0, kept as integers when every value is whole"""
+    numbers = pd.to_numeric(series, errors='coerce').fillna(0)
+    if (numbers % 1 == 0).all():
+        return numbers.astype(int)
+    return numbers
+
+def parse_dates(series):
+    """Datetimes for parseable dates, NaT for anything else"""
+    return pd.to_datetime(_clean_text(series), errors='coerce', format='mixed')
+
+def clean_dates(series):
+    """ISO 'YYYY-MM-DD' strings for parseable dates; anything else is left as entered"""
+    text = _clean_text(series)
+    parsed = parse_dates(text)
+    return parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), text)
+
+def clean_choices(series, choices):
+    """Map values onto a fixed vocabulary, falling back to title case"""
+    text = _clean_text(series)
+    return text.str.lower().map(choices).fillna(text.str.title())
+
+def prepare_games(games_df):
+    """Games with a GameID: the sheet's ID, or one made from the date and opponent"""
+    games_df = games_df.copy()
+    if 'ID' in games_df.columns:
+        games_df['GameID'] = games_df['ID']
+    else:
+        games_df['GameID'] = (
+            pd.to_datetime(games_df['Date']).dt.strftime('%Y-%m-%d') + '_' +
+            games_df['Opponent'].str.strip().str.lower().str.replace(' ', '-')
+        )
+    return games_df
+
+def prepare_events(events_df):
+    """Events with a Time column, taken from the Timestamp when the sheet has none"""
+    events_df = events_df.copy()
+    if 'Time' not in events_df.columns and 'Timestamp' in events_df.columns:
+        events_df['Time'] = pd.to_datetime(events_df['Timestamp']).dt.strftime('%H:%M')
+    return events_df
+
+def normalize_frame(df, sheet_name):
+    """Apply the sheet's schema to a raw frame in one pass
+
+    Returns a new, cleaned frame with a fresh index, stamped with its content
+    fingerprint. Quarantined rows are dropped and counted by reason in
+    `attrs['rejected']`, so callers can report them without keeping the bad
+    rows around; `attrs['sheet_rows']` counts the rows read.
+    """
+    schema = SCHEMAS[sheet_name]
+    df = df.copy()
+    rejected = {}
+
+    for col, value in schema.get('defaults', {}).items():
+        if col not in df.columns:
+            df[col] = value
+
+    columns = df.columns
+    for col in schema.get('ids', []):
+        if col in columns:
+            df[col] = clean_ids(df[col])
+    for col in schema.get('id_lists', []):
+        if col in columns:
+            df[col] = clean_id_lists(df[col])
+    for col in schema.get('team_keys', []):
+        if col in columns:
+            df[col] = clean_team_keys(df[col])
+    for col in schema.get('booleans', []):
+        if col in columns:
+            df[col] = clean_booleans(df[col])
+    for col in schema.get('numbers', []):
+        if col in columns:
+            df[col] = clean_numbers(df[col])
+    for col in schema.get('dates', []):
+        if col in columns:
+            df[col] = clean_dates(df[col])
+    for col, parsed_col in schema.get('parsed_dates', {}).items():
+        if col in columns:
+            df[parsed_col] = parse_dates(df[col])
+    for col, choices in schema.get('choices', {}).items():
+        if col in columns:
+            df[col] = clean_choices(df[col], choices)
+    for col in schema.get('upper', []):
+        if col in columns:
+            df[col] = _clean_text(df[col]).str.upper()
+    for col in schema.get('text', []):
+        if col in columns:
+            df[col] = _clean_text(df[col])
+
+    # Quarantine rows missing a required key
+    keep = pd.Series(True, index=df.index)
+    for col in schema.get('required', []):
+        if col not in columns:
+            continue
+        missing = keep & (df[col] == '')
+        if missing.any():
+            rejected[f"missing {col}"] = int(missing.sum())
+        keep &= ~missing
+
+    # Quarantine repeated primary keys, keeping the first occurrence
+    unique_cols = [col for col in schema.get('unique', []) if col in columns]
+    if unique_cols:
+        duplicated = keep & df[keep].duplicated(subset=unique_cols).reindex(df.index, fill_value=False)
+        if duplicated.any():
+            rejected[f"duplicate {'/'.join(unique_cols)}"] = int(duplicated.sum())
+        keep &= ~duplicated
+
+    sheet_rows = len(df)
+    df = df[keep].reset_index(drop=True)
+    df.attrs['rejected'] = rejected
+    # Rows read from the sheet, quarantined ones included, so live mode knows where new rows start
+    df.attrs['sheet_rows'] = sheet_rows
+    return stamp_fingerprint(df)
@@ -0,0 +1,161 @@
+import datetime
+import functools
+import json
+import random
+import threading
+import time
+
+import requests
+from gspread.exceptions import APIError
+
+def api_error(status_code=429, message="Quota exceeded for quota metric 'Read requests'", retry_after=None):
+    """A gspread APIError shaped like the ones the Sheets API raises, optionally with a Retry-After header"""
+    response = requests.models.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(retry_after)
+    response._content = json.dumps({
+        'error': {'code': status_code, 'message': message, 'status': 'RESOURCE_EXHAUSTED'}
+    }).encode()
+    return APIError(response)
+
+class FakeWorksheet:
+    """Worksheet that serves in-memory records, failing first when told to"""
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def get_all_records(self):
+        return self.client.read(self.name)
+
+    def row_values(self, row):
+        """The header row, taken from the keys of the first record"""
+        records = self.client.records.get(self.name, [])
+        return list(records[0]) if row == 1 and records else []
+
+    def batch_get(self, ranges):
+        """Whole-row ranges such as '1:1' or '5:20', as lists of cell text like the Sheets API returns"""
+        records = self.client.read(self.name)
+        header = list(records[0]) if records else []
+        grid = [header] + [[str(record.get(col, '')) for col in header] for record in records]
+        results = []
+        for range_name in ranges:
+            first, last = (int(row) for row in range_name.split(':'))
+            results.append(grid[first - 1:last])
+        return results
+
+    def append_rows(self, values, value_input_option='RAW'):
+        self.client.append(self.name, values)
+
+class FakeSpreadsheet:
+    def __init__(self, client):
+        self.client = client
+
+    def worksheet(self, name):
+        return FakeWorksheet(self.client, name)
+
+class FakeSheetsClient:
+    """Local stand-in for a gspread client
+
+    `records` maps worksheet names to lists of row dicts. `failures` maps a
+    worksheet name to the number of reads that fail with `status_code`
+    (429 by default) before reads succeed, sent with a Retry-After header
+    when `retry_after` is set, and `latency` adds a delay to every read so
+    concurrent callers overlap.
+    """
+
+    def __init__(self, records, failures=None, status_code=429, latency=0.0, retry_after=None):
+        self.records = records
+        self.failures = dict(failures or {})
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.latency = latency
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def open_by_key(self, key):
+        return FakeSpreadsheet(self)
+
+    def read(self, name):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            should_fail = self.failures.get(name, 0) > 0
+            if should_fail:
+                self.failures[name] -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if should_fail:
+            raise api_error(self.status_code, retry_after=self.retry_after)
+        return [dict(row) for row in self.records.get(name, [])]
+
+    def append(self, name, values):
+        """Add rows given as lists in header order, as one write"""
+        with self.lock:
+            self.calls[f"{name}:append"] = self.calls.get(f"{name}:append", 0) + 1
+            records = self.records.setdefault(name, [])
+            header = list(records[0]) if records else values[0]
+            rows = values if records else values[1:]
+            records.extend(dict(zip(header, row)) for row in rows)
+
+def generate_records(n_players=18, n_games=30, events_per_game=(20, 40), seed=0,
+                     opponents=("Hawks", "Bears", "Wolves", "Kings")):
+    """Synthetic Players, Games, Events and GameRoster records shaped like the real sheets"""
+    rng = random.Random(seed)
+    players = []
+    for i in range(1, n_players + 1):
+        position = "G" if i <= 2 else ("D" if i <= 8 else "F")
+        players.append({
+            "ID": f"player_{i}", "JerseyNumber": i + 2, "FirstName": f"Player{i}", "LastName": f"Skater{i}",
+            "TeamID": "your_team", "Position": position
+        })
+
+    games, events, roster = [], [], []
+    for game_id in range(1, n_games + 1):
+        date = datetime.date(2024, 9, 1) + datetime.timedelta(days=3 * (game_id - 1))
+        games.append({"ID": game_id, "Date": date.isoformat(), "Opponent": rng.choice(opponents), "Location": "Home"})
+
+        present = [p for p in players if rng.random() > 0.1]
+        for p in players:
+            roster.append({"GameID": game_id, "PlayerID": p["ID"], "Status": "Present" if p in present else "Absent"})
+        skaters = [p["ID"] for p in present if p["Position"] != "G"] or [players[-1]["ID"]]
+        goalie = next((p["ID"] for p in present if p["Position"] == "G"), players[0]["ID"])
+
+        for _ in range(rng.randint(*events_per_game)):
+            ours = rng.random() < 0.55
+            event_type = rng.choices(["Shot", "Goal", "Penalty", "Hit", "Faceoff", "PowerPlay"], [10, 2, 2, 2, 2, 1])[0]
+            event = {
+                "GameID": game_id, "EventType": event_type, "Period": rng.choice([1, 2, 3]),
+                "Time": f"{rng.randint(0, 14)}:{rng.randint(0, 59):02d}",
+                "PrimaryPlayerID": rng.choice(skaters) if ours else "", "AssistPlayer1ID": "", "AssistPlayer2ID": "",
+                "Team": "your_team" if ours else "Opponent", "IsGoal": "", "IsPowerPlay": "", "IsShortHanded": "",
+                "PenaltyType": "", "PenaltyDuration": 0, "YourTeamPlayersOnIce": ""
+            }
+            if event_type == "Goal":
+                event["IsGoal"] = "Yes"
+                event["IsPowerPlay"] = "Yes" if rng.random() < 0.15 else "No"
+                on_ice = rng.sample(skaters, min(5, len(skaters)))
+                event["YourTeamPlayersOnIce"] = ", ".join(on_ice + [goalie])
+                if ours:
+                    event["PrimaryPlayerID"] = on_ice[0]
+                    if len(on_ice) > 1 and rng.random() < 0.8:
+                        event["AssistPlayer1ID"] = on_ice[1]
+                    if len(on_ice) > 2 and rng.random() < 0.5:
+                        event["AssistPlayer2ID"] = on_ice[2]
+            elif event_type == "Penalty":
+                event["PenaltyType"] = rng.choice(["Tripping", "Hooking", "Slashing"])
+                event["PenaltyDuration"] = 2
+            events.append(event)
+
+    return {"Players": players, "Games": games, "Events": events, "GameRoster": roster}
+
+def save_records(records, path):
+    """Write sheet records to a JSON file that load_records and HOCKEY_STATS_OFFLINE can use"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+
+@functools.lru_cache(maxsize=4)
+def load_records(path):
+    """Sheet records from a JSON file mapping worksheet names to lists of row dicts"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,69 @@
+import pandas as pd
+
+from hockey_stats.aggregates import calculate_team_game_stats, get_player_game_stats, jersey_lookup
+from hockey_stats.dates import played_game_ids
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+OPPONENT_COLUMNS = ['Opponent', 'GP', 'W', 'L', 'T', 'GF', 'GA', 'Diff', 'PPG', 'PPO', 'PP%', 'PPGA', 'SHG', 'PIM', 'Top Scorer']
+
+def calculate_opponent_splits(games_df, events_df, players_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Record, goals, special teams and top scorer against each opponent
+
+    Team figures come from the game results joined with the per-game team
+    aggregates; scorers come from the player-game aggregates. Each side is a
+    single groupby on Opponent. Scheduled games without events are left out.
+    """
+    if games_df.empty or 'Opponent' not in games_df.columns:
+        return pd.DataFrame(columns=OPPONENT_COLUMNS)
+
+    games = games_df[['GameID', 'Opponent', 'Result', 'GoalsFor', 'GoalsAgainst']]
+    games = games[games['GameID'].isin(played_game_ids(games_df, events_df))]
+
+    # One row per game with results and special teams side by side
+    team_games = games.merge(calculate_team_game_stats(events_df, our_team_id), on='GameID', how='left')
+    special_cols = ['PPG', 'PPO', 'PPGA', 'SHG', 'PIM']
+    team_games[special_cols] = team_games[special_cols].fillna(0).astype(int)
+    team_games = team_games.assign(
+        W=team_games['Result'] == 'W',
+        L=team_games['Result'] == 'L',
+        T=team_games['Result'] == 'T'
+    )
+
+    splits_df = team_games.groupby('Opponent').agg(
+        GP=('GameID', 'size'),
+        W=('W', 'sum'),
+        L=('L', 'sum'),
+        T=('T', 'sum'),
+        GF=('GoalsFor', 'sum'),
+        GA=('GoalsAgainst', 'sum'),
+        PPG=('PPG', 'sum'),
+        PPO=('PPO', 'sum'),
+        PPGA=('PPGA', 'sum'),
+        SHG=('SHG', 'sum'),
+        PIM=('PIM', 'sum'),
+    ).reset_index()
+    splits_df['Diff'] = splits_df['GF'] - splits_df['GA']
+    splits_df['PP%'] = (splits_df['PPG'] / splits_df['PPO'].where(splits_df['PPO'] > 0) * 100).fillna(0)
+
+    # Top scorer against each opponent from the player-game aggregates
+    player_games = get_player_game_stats(events_df, game_roster_df, our_team_id)
+    player_games = player_games.merge(games[['GameID', 'Opponent']], on='GameID')
+    points = player_games.groupby(['Opponent', 'PlayerID'], as_index=False)[['Goals', 'Assists', 'Points']].sum()
+    points = points[points['Points'] > 0].sort_values(by=['Points', 'Goals'], ascending=False)
+    top_scorers = points.drop_duplicates('Opponent')
+
+    jerseys = jersey_lookup(players_df)
+    top_scorers = top_scorers.assign(**{
+        'Top Scorer': '#' + top_scorers['PlayerID'].map(jerseys).fillna('?').astype(str)
+        + ' (' + top_scorers['Goals'].astype(str) + 'G ' + top_scorers['Assists'].astype(str) + 'A)'
+    })
+
+    splits_df = splits_df.merge(top_scorers[['Opponent', 'Top Scorer']], on='Opponent', how='left')
+    splits_df['Top Scorer'] = splits_df['Top Scorer'].fillna('')
+    return splits_df.sort_values(by=['GP', 'Opponent'], ascending=[False, True], ignore_index=True)[OPPONENT_COLUMNS]
+
+@shared_frame()
+def get_opponent_splits(games_df, events_df, players_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached opponent splits for the currently loaded season"""
+    return calculate_opponent_splits(games_df, events_df, players_df, game_roster_df, our_team_id)
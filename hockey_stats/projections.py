@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+from hockey_stats.aggregates import get_player_game_stats
+from hockey_stats.dates import played_game_ids
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+# Enough runs for stable 10th/90th percentiles; a fixed seed keeps cached projections identical across sessions
+SIMULATIONS = 20000
+SEED = 0
+
+PERCENTILES = [10, 50, 90]
+
+TEAM_PROJECTION_COLUMNS = ['Stat', 'Current', 'P10', 'P50', 'P90']
+
+PLAYER_PROJECTION_COLUMNS = [
+    'PlayerID', 'JerseyNumber', 'FirstName', 'LastName', 'Position', 'GP', 'Goals', 'Assists', 'Points',
+    'Goals P50', 'Points P10', 'Points P50', 'Points P90'
+]
+
+def unplayed_games(games_df, events_df):
+    """Number of scheduled games with no events yet"""
+    return len(games_df) - len(played_game_ids(games_df, events_df))
+
+def _bands(simulated, current):
+    """Current value plus the percentile bands of current + simulated, per column"""
+    return np.percentile(current + simulated, PERCENTILES, axis=0)
+
+def calculate_team_projection(results_df, played_ids, games_left, simulations=SIMULATIONS, seed=SEED):
+    """Final standings points, wins and goals for the season, as percentile bands
+
+    Goals for and against in each remaining game are drawn from Poisson
+    distributions at the season's per-game averages, for every simulation
+    and game at once. A win is worth 2 points and a tie 1.
+    """
+    played = results_df[results_df['GameID'].isin(played_ids)]
+    if played.empty:
+        return pd.DataFrame(columns=TEAM_PROJECTION_COLUMNS)
+
+    wins = (played['Result'] == 'W').sum()
+    ties = (played['Result'] == 'T').sum()
+    current = {
+        'Points': 2 * wins + ties,
+        'Wins': wins,
+        'Goals For': played['GoalsFor'].sum(),
+        'Goals Against': played['GoalsAgainst'].sum(),
+    }
+
+    rng = np.random.default_rng(seed)
+    goals_for = rng.poisson(played['GoalsFor'].mean(), size=(simulations, games_left))
+    goals_against = rng.poisson(played['GoalsAgainst'].mean(), size=(simulations, games_left))
+    sim_wins = (goals_for > goals_against).sum(axis=1)
+    sim_ties = (goals_for == goals_against).sum(axis=1)
+    simulated = np.column_stack([
+        2 * sim_wins + sim_ties, sim_wins, goals_for.sum(axis=1), goals_against.sum(axis=1)
+    ])
+
+    bands = _bands(simulated, np.array(list(current.values())))
+    projection_df = pd.DataFrame(bands.T, columns=['P10', 'P50', 'P90']).round().astype(int)
+    projection_df.insert(0, 'Current', [int(value) for value in current.values()])
+    projection_df.insert(0, 'Stat', list(current))
+    return projection_df[TEAM_PROJECTION_COLUMNS]
+
+def calculate_player_projection(players_df, player_game_df, games_played, games_left,
+                                simulations=SIMULATIONS, seed=SEED):
+    """Final goal and point totals for every player, as percentile bands
+
+    Each player plays a remaining game with their attendance rate so far and
+    scores at their goals and assists per game played. Summed over the
+    remaining games that is a binomial number of games and Poisson goals and
+    assists, drawn for all players and simulations as single arrays.
+    """
+    if players_df.empty:
+        return pd.DataFrame(columns=PLAYER_PROJECTION_COLUMNS)
+
+    season_df = players_df[['ID', 'JerseyNumber', 'FirstName', 'LastName', 'Position']].rename(columns={'ID': 'PlayerID'})
+    totals = player_game_df.groupby('PlayerID').agg(
+        GP=('Present', 'sum'), Goals=('Goals', 'sum'), Assists=('Assists', 'sum'), Points=('Points', 'sum')
+    )
+    season_df = season_df.merge(totals, left_on='PlayerID', right_index=True, how='left')
+    count_cols = ['GP', 'Goals', 'Assists', 'Points']
+    season_df[count_cols] = season_df[count_cols].fillna(0).astype(int)
+
+    gp = season_df['GP'].to_numpy()
+    per_game = np.maximum(gp, 1)
+    attendance = np.clip(gp / max(games_played, 1), 0, 1)
+    goal_rate = season_df['Goals'].to_numpy() / per_game
+    assist_rate = season_df['Assists'].to_numpy() / per_game
+
+    rng = np.random.default_rng(seed)
+    size = (simulations, len(season_df))
+    games = rng.binomial(games_left, attendance, size=size)
+    goals = rng.poisson(goal_rate * games)
+    points = goals + rng.poisson(assist_rate * games)
+
+    season_df['Goals P50'] = np.percentile(season_df['Goals'].to_numpy() + goals, 50, axis=0).round().astype(int)
+    point_bands = _bands(points, season_df['Points'].to_numpy()).round().astype(int)
+    season_df['Points P10'], season_df['Points P50'], season_df['Points P90'] = point_bands
+    return season_df.sort_values(by=['Points P50', 'Points'], ascending=False)[PLAYER_PROJECTION_COLUMNS]
+
+@shared_frame()
+def get_team_projection(games_df, events_df, games_left):
+    """Cached team projection for a data version and number of games left"""
+    return calculate_team_projection(games_df, played_game_ids(games_df, events_df), games_left)
+
+@shared_frame()
+def get_player_projection(players_df, games_df, events_df, game_roster_df, games_left, our_team_id=OUR_TEAM_ID):
+    """Cached player projection, built from the cached player-game aggregates"""
+    return calculate_player_projection(
+        players_df,
+        get_player_game_stats(events_df, game_roster_df, our_team_id),
+        len(played_game_ids(games_df, events_df)),
+        games_left
+    )
@@ -0,0 +1,242 @@
+import argparse
+import html
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from hockey_stats.aggregates import calculate_player_game_stats
+from hockey_stats.archive import CURRENT_SEASON, read_archive
+from hockey_stats.boxscores import (
+    GOALIE_BOX_COLUMNS, SKATER_BOX_COLUMNS, calculate_player_box_scores, calculate_team_box_scores, game_box_score
+)
+from hockey_stats.breakdowns import calculate_player_breakdowns
+from hockey_stats.dates import calculate_game_index
+from hockey_stats.comparison import RATE_COLUMNS, SEASON_LINE_COLUMNS, calculate_comparison_table
+from hockey_stats.normalize import OUR_TEAM_ID
+
+# Bundles are written to reports/<season>/ unless another directory is given
+REPORTS_DIR = Path(os.environ.get("HOCKEY_STATS_REPORTS", "reports"))
+
+GAME_LOG_COLUMNS = ['Date', 'Opponent', 'Result', 'Goals', 'Assists', 'Points', '+/-', 'Shots', 'PIM']
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body {{ font-family: 'Roboto', sans-serif; color: #000000; background: #F0F2F5; margin: 0 auto; max-width: 960px; padding: 16px; }}
+h1, h2 {{ color: #00205B; border-bottom: 2px solid #00A0E3; padding-bottom: 4px; }}
+table {{ border-collapse: collapse; width: 100%; background: #FFFFFF; margin-bottom: 16px; }}
+th {{ background: #00205B; color: #FFFFFF; }}
+th, td {{ border: 1px solid #E0E0E0; padding: 4px 8px; text-align: right; }}
+td:first-child, th:first-child {{ text-align: left; }}
+p.meta {{ color: #333333; }}
+a {{ color: #00205B; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+# Frames the workers render from, set once per worker process by _init_worker
+_frames = {}
+
+def slug(value):
+    """File name for an ID: letters, digits, dashes and underscores only"""
+    return re.sub(r'[^A-Za-z0-9_-]+', '-', str(value)).strip('-') or 'unknown'
+
+def player_title(player):
+    return f"#{player['JerseyNumber']} {player['FirstName']} {player['LastName']} ({player['Position']})"
+
+def format_cell(value):
+    """Cell text: blanks for missing values, two decimals for fractions"""
+    if value is None or value is pd.NA or value != value:
+        return ''
+    if isinstance(value, str):
+        return html.escape(value)
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+def html_table(df):
+    """HTML table for a report section
+
+    Built by hand rather than with DataFrame.to_html, which takes longer
+    than the rest of a report page put together.
+    """
+    header = ''.join(f"<th>{html.escape(str(col))}</th>" for col in df.columns)
+    rows = '\n'.join(
+        '<tr>' + ''.join(f"<td>{format_cell(value)}</td>" for value in row) + '</tr>'
+        for row in df.to_numpy(dtype=object)
+    )
+    return f"<table>\n<thead><tr>{header}</tr></thead>\n<tbody>\n{rows}\n</tbody>\n</table>"
+
+def render_page(title, sections, meta=None):
+    """A standalone HTML page from (heading, html) sections"""
+    body = [f'<p class="meta">{html.escape(meta)}</p>'] if meta else []
+    for heading, content in sections:
+        body.append(f"<h2>{html.escape(heading)}</h2>\n{content}")
+    return PAGE_TEMPLATE.format(title=html.escape(title), body="\n".join(body))
+
+def build_report_frames(players_df, games_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Every aggregate the reports read, computed once for the whole season"""
+    player_game_df = calculate_player_game_stats(events_df, game_roster_df, our_team_id)
+    game_log_df = player_game_df.merge(games_df[['GameID', 'Date', 'Opponent', 'Result']], on='GameID')
+    game_log_df = game_log_df.merge(calculate_game_index(games_df)[['GameID', 'Order']], on='GameID')
+    game_log_df = game_log_df[game_log_df['Present'] | (game_log_df[['Goals', 'Assists', 'Shots', 'PIM']].sum(axis=1) > 0)]
+
+    return {
+        'comparison': calculate_comparison_table(players_df, player_game_df, calculate_player_breakdowns(events_df, our_team_id)),
+        'game_log': game_log_df.sort_values(by=['PlayerID', 'Order']).set_index('PlayerID'),
+        'team_box': calculate_team_box_scores(games_df, events_df),
+        'player_box': calculate_player_box_scores(players_df, games_df, player_game_df, events_df, game_roster_df, our_team_id),
+    }
+
+def render_player_report(player_id, frames, season_label):
+    """HTML stat sheet for one player: season line, rates, scoring splits and game log"""
+    player = frames['comparison'].loc[player_id]
+    split_cols = [col for col in frames['comparison'].columns if col.startswith('Pts ')]
+    line = player.to_frame().T.infer_objects()
+
+    sections = [
+        ("Season", html_table(line[SEASON_LINE_COLUMNS])),
+        ("Per Game", html_table(line[RATE_COLUMNS])),
+    ]
+    if split_cols:
+        sections.append(("Points by Game State and Period", html_table(line[split_cols])))
+
+    game_log = frames['game_log'].loc[[player_id]] if player_id in frames['game_log'].index else frames['game_log'].iloc[0:0]
+    sections.append(("Game Log", html_table(game_log[GAME_LOG_COLUMNS]) if not game_log.empty else "<p>No games played.</p>"))
+    return render_page(player_title(player), sections, meta=season_label)
+
+def render_game_report(game_id, frames, season_label):
+    """HTML box score for one game: score line, team figures and player lines"""
+    game, player_lines = game_box_score(frames['team_box'], frames['player_box'], game_id)
+    summary = pd.DataFrame({
+        'Stat': ['Result', 'Score', 'Shots', 'Penalty Minutes', 'Power Play', 'Power Play %'],
+        'Value': [
+            game['Result'],
+            f"{game['GoalsFor']}-{game['GoalsAgainst']}",
+            game['Shots'],
+            game['PIM'],
+            f"{game['PPG']}/{game['PPO']}",
+            f"{game['PP%']:.1f}%",
+        ]
+    })
+    identity = ['JerseyNumber', 'FirstName', 'LastName', 'Position']
+    skaters = player_lines[player_lines['Position'] != 'G']
+    goalies = player_lines[player_lines['Position'] == 'G']
+
+    sections = [("Summary", html_table(summary))]
+    if not skaters.empty:
+        sections.append(("Skaters", html_table(skaters[identity + SKATER_BOX_COLUMNS])))
+    if not goalies.empty:
+        sections.append(("Goalies", html_table(goalies[identity + GOALIE_BOX_COLUMNS])))
+    return render_page(game['Label'], sections, meta=season_label)
+
+def _init_worker(frames):
+    _frames.update(frames)
+
+def _write_reports(jobs):
+    """Render and write a chunk of (kind, id, path, season label) jobs in a worker"""
+    renderers = {'player': render_player_report, 'game': render_game_report}
+    for kind, item_id, path, season_label in jobs:
+        Path(path).write_text(renderers[kind](item_id, _frames, season_label), encoding='utf-8')
+    return len(jobs)
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def write_report_bundle(frames, out_dir, season_label="", workers=None, zip_bundle=True):
+    """Write a report per player and per game plus an index page, across a process pool
+
+    The aggregates are sent to each worker once; jobs go out in chunks so
+    the pool's overhead stays small next to the rendering. Returns the
+    bundle directory, or the zip file when `zip_bundle` is set.
+    """
+    out_dir = Path(out_dir)
+    (out_dir / "players").mkdir(parents=True, exist_ok=True)
+    (out_dir / "games").mkdir(parents=True, exist_ok=True)
+
+    players = frames['comparison'].sort_values(by=['Position', 'JerseyNumber'])
+    games = frames['team_box']
+    jobs = [('player', pid, str(out_dir / "players" / f"{slug(pid)}.html"), season_label) for pid in players.index]
+    jobs += [('game', gid, str(out_dir / "games" / f"{slug(gid)}.html"), season_label) for gid in games.index]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(frames)
+        _write_reports(jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(frames,)) as pool:
+            list(pool.map(_write_reports, _chunks(jobs, max(1, len(jobs) // (workers * 4)))))
+
+    player_links = "\n".join(
+        f'<li><a href="players/{slug(pid)}.html">{html.escape(player_title(player))}</a></li>'
+        for pid, player in players.iterrows()
+    )
+    game_links = "\n".join(
+        f'<li><a href="games/{slug(gid)}.html">{html.escape(str(label))}</a></li>'
+        for gid, label in games['Label'].items()
+    )
+    index = render_page(
+        "Season Reports",
+        [("Players", f"<ul>\n{player_links}\n</ul>"), ("Games", f"<ul>\n{game_links}\n</ul>")],
+        meta=season_label
+    )
+    (out_dir / "index.html").write_text(index, encoding='utf-8')
+
+    if zip_bundle:
+        return Path(shutil.make_archive(str(out_dir), 'zip', root_dir=out_dir))
+    return out_dir
+
+def load_season(season=None, team=OUR_TEAM_ID):
+    """Players, games with results, events and roster for an archived season, or the live spreadsheet"""
+    from hockey_stats.sheets_service import calculate_game_results
+
+    if season:
+        frames = [
+            read_archive(table_name, seasons=[season], teams=[team]).drop(columns=['season', 'team'], errors='ignore')
+            for table_name in ['Players', 'Games', 'Events', 'GameRoster']
+        ]
+    else:
+        from hockey_stats.sheets_service import get_events_data, get_game_roster_data, get_games_data, get_players_data
+        frames = [get_players_data(), get_games_data(), get_events_data(), get_game_roster_data()]
+
+    players_df, games_df, events_df, game_roster_df = frames
+    return players_df, calculate_game_results(games_df, events_df, team), events_df, game_roster_df
+
+def main():
+    """Command line entry point: python -m hockey_stats.reports [--season 2024-25]"""
+    parser = argparse.ArgumentParser(description="Write HTML stat sheets for every player and game")
+    parser.add_argument('--season', help="Archived season to report on; defaults to the spreadsheet")
+    parser.add_argument('--team', default=OUR_TEAM_ID)
+    parser.add_argument('--out', help="Bundle directory; defaults to reports/<season>")
+    parser.add_argument('--workers', type=int, help="Worker processes; defaults to the CPU count")
+    parser.add_argument('--no-zip', action='store_true', help="Leave the bundle as a directory")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    players_df, games_df, events_df, game_roster_df = load_season(args.season, args.team)
+    if players_df.empty:
+        parser.error("No players to report on")
+    frames = build_report_frames(players_df, games_df, events_df, game_roster_df, args.team)
+
+    season_label = args.season or CURRENT_SEASON
+    out_dir = args.out or REPORTS_DIR / slug(season_label)
+    bundle = write_report_bundle(frames, out_dir, season_label, args.workers, zip_bundle=not args.no_zip)
+    print(f"Wrote {len(frames['comparison'])} player and {len(frames['team_box'])} game reports to {bundle} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+
+import requests
+
+# Google Sheets allows 60 read requests per minute per user
+SHEETS_READS_PER_MINUTE = 60
+
+# Status codes worth retrying: rate limited or a transient server error
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket that refills continuously at `rate_per_minute`"""
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Take `tokens`, waiting for the bucket to refill if needed"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            self.sleep(wait)
+
+class _Flight:
+    """A request in progress that other callers for the same key can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+def status_code(exc):
+    """HTTP status of a gspread APIError (or any error carrying a response), if any"""
+    response = getattr(exc, 'response', None)
+    return getattr(response, 'status_code', None)
+
+def is_retryable(exc):
+    """Rate limits, transient server errors and dropped connections are retried"""
+    if status_code(exc) in RETRYABLE_STATUS_CODES:
+        return True
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError))
+
+def retry_after(exc):
+    """Seconds the server asked us to wait in a Retry-After header, if any"""
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+class SheetsScheduler:
+    """Central gate for Sheets API reads
+
+    - A token bucket keeps the process under the per-minute read quota.
+    - Rate limits and server errors are retried with full-jitter exponential
+      backoff, honouring Retry-After when the server sends it.
+    - Concurrent requests for the same key are coalesced (single-flight): one
+      caller fetches and everyone waiting on that key shares the result.
+    """
+
+    def __init__(self, requests_per_minute=SHEETS_READS_PER_MINUTE, max_retries=5, base_delay=1.0,
+                 max_delay=32.0, clock=time.monotonic, sleep=time.sleep, jitter=random.random):
+        self.bucket = TokenBucket(requests_per_minute, clock=clock, sleep=sleep)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.stats = {'requests': 0, 'coalesced': 0, 'retries': 0, 'failures': 0}
+
+    def backoff_delay(self, attempt, exc=None):
+        """Full jitter: a random delay up to the capped exponential for this attempt"""
+        delay = self.jitter() * min(self.max_delay, self.base_delay * 2 ** attempt)
+        return max(delay, retry_after(exc)) if exc is not None else delay
+
+    def _call_with_retry(self, fn, cost):
+        attempt = 0
+        while True:
+            self.bucket.acquire(cost)
+            with self.lock:
+                self.stats['requests'] += 1
+            try:
+                return fn()
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    with self.lock:
+                        self.stats['failures'] += 1
+                    raise
+                with self.lock:
+                    self.stats['retries'] += 1
+                self.sleep(self.backoff_delay(attempt, exc))
+                attempt += 1
+
+    def run(self, key, fn, cost=1):
+        """Call `fn` through the quota and retry policy, sharing the result with concurrent callers for `key`
+
+        `cost` is the number of API requests `fn` makes, so it is charged
+        that many tokens per attempt.
+        """
+        with self.lock:
+            flight = self.in_flight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self.in_flight[key] = _Flight()
+            else:
+                self.stats['coalesced'] += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._call_with_retry(fn, cost)
+            return flight.result
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            flight.done.set()
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """The process-wide scheduler shared by every session"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SheetsScheduler()
+        return _scheduler
@@ -0,0 +1,93 @@
+import difflib
+
+import numpy as np
+import pandas as pd
+
+from hockey_stats.shared import shared_frame
+
+PLAYER_OPTION_COLUMNS = ['ID', 'Label', 'FirstName', 'LastName', 'JerseyNumber', 'Position', 'TeamID']
+
+# Row is the option's row number in the player options frame
+PLAYER_TOKEN_COLUMNS = ['Token', 'Row']
+
+def _jersey_sort_key(jersey):
+    """Numeric jerseys in number order, anything else after them"""
+    number = pd.to_numeric(jersey, errors='coerce')
+    return number.fillna(np.inf)
+
+def calculate_player_options(players_df):
+    """Selector options for every player, in jersey order, indexed by player ID
+
+    Labels show the jersey number only, with the team added when the roster
+    spans more than one team.
+    """
+    if players_df.empty:
+        return pd.DataFrame(columns=PLAYER_OPTION_COLUMNS).set_index('ID', drop=False)
+
+    options_df = players_df.reindex(columns=PLAYER_OPTION_COLUMNS).fillna('')
+    label = '#' + options_df['JerseyNumber'].astype(str)
+    if options_df['TeamID'].nunique() > 1:
+        label = label + ' · ' + options_df['TeamID']
+    options_df['Label'] = label
+
+    options_df = options_df.assign(_jersey=_jersey_sort_key(options_df['JerseyNumber']))
+    options_df = options_df.sort_values(by=['_jersey', 'TeamID', 'LastName'], kind='stable').drop(columns='_jersey')
+    return options_df.set_index('ID', drop=False)
+
+def calculate_player_tokens(options_df):
+    """Sorted search tokens with the option row each one points to
+
+    Every player contributes their first name, last name, jersey number, team
+    and position, lowercased. Keeping the tokens sorted lets a prefix be
+    found with a binary search.
+    """
+    if options_df.empty:
+        return pd.DataFrame(columns=PLAYER_TOKEN_COLUMNS)
+
+    fields = ['FirstName', 'LastName', 'JerseyNumber', 'TeamID', 'Position']
+    tokens = options_df[fields].astype(str).reset_index(drop=True).melt(ignore_index=False, value_name='Token')
+    tokens = tokens[tokens['Token'] != '']
+    tokens_df = pd.DataFrame({
+        'Token': tokens['Token'].str.lower().to_numpy(),
+        'Row': tokens.index.to_numpy(),
+    })
+    return tokens_df.drop_duplicates().sort_values(by=['Token', 'Row'], ignore_index=True)
+
+def _prefix_matches(tokens_df, term):
+    """Option rows with a token starting with `term`, by binary search"""
+    tokens = tokens_df['Token'].to_numpy()
+    start = np.searchsorted(tokens, term, side='left')
+    stop = np.searchsorted(tokens, term + '\uffff', side='left')
+    return set(tokens_df['Row'].to_numpy()[start:stop])
+
+def _fuzzy_matches(tokens_df, term, cutoff=0.75):
+    """Option rows with a token close to `term`, for typos such as 'jonh'"""
+    close = difflib.get_close_matches(term, tokens_df['Token'].unique().tolist(), n=5, cutoff=cutoff)
+    return set(tokens_df.loc[tokens_df['Token'].isin(close), 'Row'])
+
+def search_players(options_df, tokens_df, query):
+    """Options matching every word of `query` by prefix, or by close spelling when nothing starts with it
+
+    An empty query returns all options.
+    """
+    terms = query.lower().replace('#', ' ').split()
+    if not terms:
+        return options_df
+
+    rows = None
+    for term in terms:
+        matches = _prefix_matches(tokens_df, term) or _fuzzy_matches(tokens_df, term)
+        rows = matches if rows is None else rows & matches
+        if not rows:
+            return options_df.iloc[0:0]
+    return options_df.iloc[sorted(rows)]
+
+@shared_frame()
+def get_player_options(players_df):
+    """Cached selector options, built once per version of the Players sheet"""
+    return calculate_player_options(players_df)
+
+@shared_frame()
+def get_player_tokens(players_df):
+    """Cached search tokens, built once per version of the Players sheet"""
+    return calculate_player_tokens(get_player_options(players_df))
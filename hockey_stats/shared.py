@@ -0,0 +1,60 @@
+import functools
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from hockey_stats.metrics import BUILD_SECONDS, CACHE_REQUESTS
+from hockey_stats.versioning import FRAME_HASH_FUNCS, stamp_fingerprint, stamped_fingerprint
+
+def share(df):
+    """A copy of a shared frame for one caller that can never change the shared frame
+
+    The app turns on pandas copy-on-write at startup, so the copy is a view
+    that costs nothing until it is written to. Without it, as in the command
+    line tools, the copy is a full one. It carries the shared frame's attrs
+    and fingerprint stamp, as its contents are the same.
+    """
+    if isinstance(df, pd.DataFrame):
+        view = df.copy(deep=not pd.get_option("mode.copy_on_write"))
+        fingerprint = stamped_fingerprint(df)
+        return stamp_fingerprint(view, fingerprint) if fingerprint else view
+    return df
+
+# Each game window or date range keys new entries for every cached table, so keep the most recent ones only
+MAX_ENTRIES = 64
+
+def shared_frame(ttl=3600, show_spinner=False, max_entries=MAX_ENTRIES):
+    """Cache a frame-building function once per process for every session
+
+    st.cache_data pickles its result and unpickles a fresh copy on every call
+    in every session. This keeps a single frame in st.cache_resource instead
+    and hands each caller a copy-on-write view of it. DataFrame arguments are
+    keyed on their fingerprint, and the least recently used of more than
+    `max_entries` results are dropped.
+    """
+    def decorator(func):
+        name = func.__name__
+        # Set by `build` when the cache calls through, so the wrapper can tell a miss from a hit
+        state = threading.local()
+
+        @functools.wraps(func)
+        def build(*args, **kwargs):
+            state.missed = True
+            with BUILD_SECONDS.time(function=name):
+                return func(*args, **kwargs)
+
+        cached = st.cache_resource(
+            ttl=ttl, show_spinner=show_spinner, max_entries=max_entries, hash_funcs=FRAME_HASH_FUNCS
+        )(build)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state.missed = False
+            result = cached(*args, **kwargs)
+            CACHE_REQUESTS.inc(function=name, result='miss' if state.missed else 'hit')
+            return share(result)
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
@@ -0,0 +1,130 @@
+import pandas as pd
+
+from hockey_stats.aggregates import explode_players_on_ice, get_player_game_stats, shots_on_goal
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+PLAYER_SHOT_COLUMNS = ['PlayerID', 'GameID', 'SOG', 'Goals', 'OnIceSF', 'OnIceSA']
+
+TEAM_SHOT_COLUMNS = ['GameID', 'SF', 'SA', 'GF', 'GA', 'SF%', 'Shooting %', 'SV%']
+
+SEASON_SHOT_COLUMNS = [
+    'PlayerID', 'JerseyNumber', 'FirstName', 'LastName', 'Position', 'GP',
+    'SOG', 'Goals', 'Shooting %', 'SOG/GP', 'OnIceSF', 'OnIceSA', 'SF%'
+]
+
+# Fewest shots on goal, and on-ice shots, before a player ranks on the rate leaderboards
+MIN_LEADERBOARD_SHOTS = 10
+
+def _shot_flags(events_df, our_team_id):
+    """Shots on goal (saved shots and goals) and whose they were, per event"""
+    return pd.DataFrame({
+        'GameID': events_df['GameID'],
+        'OnGoal': shots_on_goal(events_df),
+        'IsGoal': events_df['IsGoal'],
+        'IsOurs': events_df['Team'] == our_team_id,
+    }, index=events_df.index)
+
+def _percent(part, whole):
+    """part / whole * 100, or 0 where whole is 0"""
+    return (part / whole.where(whole > 0) * 100).fillna(0)
+
+def calculate_player_shot_metrics(events_df, our_team_id=OUR_TEAM_ID):
+    """Each player's shots on goal, goals, and shots for and against while on the ice, per game
+
+    Shooter and on-ice rows are stacked and grouped in one pass. On-ice
+    counts only cover events that record who was on the ice; where only
+    goals record it, they are goals for and against on ice.
+    """
+    if events_df.empty:
+        return pd.DataFrame(columns=PLAYER_SHOT_COLUMNS)
+
+    flags = _shot_flags(events_df, our_team_id)
+    shots = flags[flags['OnGoal']]
+
+    shooters = pd.DataFrame({
+        'PlayerID': events_df.loc[shots.index, 'PrimaryPlayerID'],
+        'GameID': shots['GameID'],
+        'SOG': shots['IsOurs'].astype(int),
+        'Goals': (shots['IsGoal'] & shots['IsOurs']).astype(int),
+    })
+    shooters = shooters[(shooters['PlayerID'] != '') & (shooters['SOG'] > 0)]
+
+    on_ice = explode_players_on_ice(events_df.loc[shots.index])
+    on_ice_ours = shots.loc[on_ice.index, 'IsOurs']
+    on_ice_rows = pd.DataFrame({
+        'PlayerID': on_ice.to_numpy(),
+        'GameID': shots.loc[on_ice.index, 'GameID'].to_numpy(),
+        'OnIceSF': on_ice_ours.astype(int).to_numpy(),
+        'OnIceSA': (~on_ice_ours).astype(int).to_numpy(),
+    })
+
+    stacked = pd.concat([shooters, on_ice_rows], ignore_index=True).fillna(0)
+    player_df = stacked.groupby(['PlayerID', 'GameID']).sum().astype(int).reset_index()
+    return player_df[PLAYER_SHOT_COLUMNS]
+
+def calculate_team_shot_metrics(events_df, our_team_id=OUR_TEAM_ID):
+    """Shots and goals for and against, shot share, shooting and save percentage per game"""
+    if events_df.empty:
+        return pd.DataFrame(columns=TEAM_SHOT_COLUMNS)
+
+    flags = _shot_flags(events_df, our_team_id)
+    per_event = pd.DataFrame({
+        'GameID': flags['GameID'],
+        'SF': flags['OnGoal'] & flags['IsOurs'],
+        'SA': flags['OnGoal'] & ~flags['IsOurs'],
+        'GF': flags['IsGoal'] & flags['IsOurs'],
+        'GA': flags['IsGoal'] & ~flags['IsOurs'],
+    })
+    team_df = per_event.groupby('GameID').sum().astype(int).reset_index()
+    team_df['SF%'] = _percent(team_df['SF'], team_df['SF'] + team_df['SA'])
+    team_df['Shooting %'] = _percent(team_df['GF'], team_df['SF'])
+    team_df['SV%'] = _percent(team_df['SA'] - team_df['GA'], team_df['SA']) / 100
+    return team_df[TEAM_SHOT_COLUMNS]
+
+def calculate_season_shot_metrics(players_df, player_shots_df, player_game_df):
+    """Season shooting line for every player: shots on goal, shooting %, shots per game and on-ice shot share"""
+    if players_df.empty:
+        return pd.DataFrame(columns=SEASON_SHOT_COLUMNS)
+
+    season_df = players_df[['ID', 'JerseyNumber', 'FirstName', 'LastName', 'Position']].rename(columns={'ID': 'PlayerID'})
+    totals = player_shots_df.groupby('PlayerID')[['SOG', 'Goals', 'OnIceSF', 'OnIceSA']].sum()
+    totals['GP'] = player_game_df.groupby('PlayerID')['Present'].sum()
+    season_df = season_df.merge(totals, left_on='PlayerID', right_index=True, how='left')
+
+    count_cols = ['GP', 'SOG', 'Goals', 'OnIceSF', 'OnIceSA']
+    season_df[count_cols] = season_df[count_cols].fillna(0).astype(int)
+    season_df['Shooting %'] = _percent(season_df['Goals'], season_df['SOG'])
+    season_df['SOG/GP'] = (season_df['SOG'] / season_df['GP'].where(season_df['GP'] > 0)).fillna(0)
+    season_df['SF%'] = _percent(season_df['OnIceSF'], season_df['OnIceSF'] + season_df['OnIceSA'])
+    return season_df[SEASON_SHOT_COLUMNS]
+
+def shot_leaders(season_shots_df, category, position=None, limit=5, min_shots=MIN_LEADERBOARD_SHOTS):
+    """Top players in a shot category; rate categories need `min_shots` behind them to qualify"""
+    leaders = season_shots_df
+    if position:
+        leaders = leaders[leaders['Position'] == position]
+    if category == 'Shooting %':
+        leaders = leaders[leaders['SOG'] >= min_shots]
+    elif category == 'SF%':
+        leaders = leaders[leaders['OnIceSF'] + leaders['OnIceSA'] >= min_shots]
+    return leaders.sort_values(by=[category, 'SOG'], ascending=False).head(limit)
+
+@shared_frame()
+def get_player_shot_metrics(events_df, our_team_id=OUR_TEAM_ID):
+    """Cached player shot metrics per game"""
+    return calculate_player_shot_metrics(events_df, our_team_id)
+
+@shared_frame()
+def get_team_shot_metrics(events_df, our_team_id=OUR_TEAM_ID):
+    """Cached team shot metrics per game"""
+    return calculate_team_shot_metrics(events_df, our_team_id)
+
+@shared_frame()
+def get_season_shot_metrics(players_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached season shooting lines, built from the cached per-game shot and player aggregates"""
+    return calculate_season_shot_metrics(
+        players_df,
+        get_player_shot_metrics(events_df, our_team_id),
+        get_player_game_stats(events_df, game_roster_df, our_team_id)
+    )
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from hockey_stats.aggregates import get_player_game_stats
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+# Per-game rates that describe how a player plays; special teams involvement is PP and SH goals
+FEATURE_SOURCES = {
+    'Goals/GP': 'Goals',
+    'Assists/GP': 'Assists',
+    'Shots/GP': 'Shots',
+    'PIM/GP': 'PIM',
+    '+/-/GP': '+/-',
+    'PPG/GP': 'PPG',
+    'SHG/GP': 'SHG',
+}
+FEATURE_COLUMNS = list(FEATURE_SOURCES)
+
+PLAYER_INFO_COLUMNS = ['JerseyNumber', 'FirstName', 'LastName', 'Position', 'GP']
+
+def calculate_player_rates(players_df, player_game_df):
+    """Per-game rates for every player with a game played, indexed by player ID"""
+    if players_df.empty or player_game_df.empty:
+        return pd.DataFrame(columns=PLAYER_INFO_COLUMNS + FEATURE_COLUMNS)
+
+    totals = player_game_df.groupby('PlayerID').agg(
+        GP=('Present', 'sum'),
+        **{source: (source, 'sum') for source in FEATURE_SOURCES.values()}
+    )
+    totals = totals[totals['GP'] > 0]
+    rates = pd.DataFrame({rate: totals[source] / totals['GP'] for rate, source in FEATURE_SOURCES.items()})
+    info = players_df.set_index('ID')[PLAYER_INFO_COLUMNS[:-1]]
+    return info.join(totals[['GP']].join(rates), how='inner')[PLAYER_INFO_COLUMNS + FEATURE_COLUMNS]
+
+def calculate_feature_matrix(rates_df):
+    """Unit-length feature vectors, one row per player, so cosine similarity is a dot product
+
+    Each rate is standardized across the roster first, so goals and PIM
+    count equally however differently they are scaled.
+    """
+    if rates_df.empty:
+        return pd.DataFrame(columns=FEATURE_COLUMNS)
+
+    features = rates_df[FEATURE_COLUMNS].astype(float)
+    spread = features.std(ddof=0).replace(0, 1)
+    standardized = ((features - features.mean()) / spread).to_numpy()
+    norms = np.linalg.norm(standardized, axis=1, keepdims=True)
+    unit = np.divide(standardized, norms, out=np.zeros_like(standardized), where=norms > 0)
+    return pd.DataFrame(unit, index=rates_df.index, columns=FEATURE_COLUMNS)
+
+def similar_players(feature_df, rates_df, player_id, limit=5, position=None):
+    """The players closest to `player_id` by cosine distance, nearest first
+
+    Compares the player against the whole matrix in one product. `position`
+    limits the matches to one position.
+    """
+    if player_id not in feature_df.index:
+        return pd.DataFrame(columns=PLAYER_INFO_COLUMNS + ['Similarity'] + FEATURE_COLUMNS)
+
+    similarity = pd.Series(feature_df.to_numpy() @ feature_df.loc[player_id].to_numpy(), index=feature_df.index)
+    candidates = rates_df.index != player_id
+    if position:
+        candidates &= rates_df['Position'] == position
+    matches = similarity[candidates].nlargest(limit)
+    return rates_df.loc[matches.index, PLAYER_INFO_COLUMNS].assign(Similarity=matches * 100).join(rates_df[FEATURE_COLUMNS])
+
+@shared_frame()
+def get_player_rates(players_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached per-game rates, built from the cached player-game aggregates"""
+    return calculate_player_rates(players_df, get_player_game_stats(events_df, game_roster_df, our_team_id))
+
+@shared_frame()
+def get_feature_matrix(players_df, events_df, game_roster_df, our_team_id=OUR_TEAM_ID):
+    """Cached normalized feature matrix for the currently loaded season"""
+    return calculate_feature_matrix(get_player_rates(players_df, events_df, game_roster_df, our_team_id))
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from hockey_stats.shared import shared_frame
+
+TIMELINE_COLUMNS = [
+    'GameID', 'Period', 'Time', 'Event', 'Description', 'Team',
+    'PrimaryPlayerID', 'AssistPlayer1ID', 'AssistPlayer2ID', 'SortTime'
+]
+
+def filter_timeline(timeline_df, game_id, period=None, event_type=None, player_id=None):
+    """Rows of one game's timeline matching the optional period, event type and player filters"""
+    mask = timeline_df['GameID'] == game_id
+    if period:
+        mask &= timeline_df['Period'] == period
+    if event_type:
+        mask &= timeline_df['Event'] == event_type
+    if player_id:
+        mask &= timeline_df[['PrimaryPlayerID', 'AssistPlayer1ID', 'AssistPlayer2ID']].eq(player_id).any(axis=1)
+    return timeline_df[mask]
+
+def calculate_timeline(events_df, players_df):
+    """Timeline rows with descriptions for every game, built column-wise
+
+    The primary and assist player IDs are kept so the timeline can be filtered
+    by player without going back to the events.
+    """
+    if events_df.empty:
+        return pd.DataFrame(columns=TIMELINE_COLUMNS)
+
+    # Skip events without period or time
+    events = events_df[(events_df['Period'] != '') & (events_df['Time'] != '')]
+
+    names = (players_df['FirstName'] + ' ' + players_df['LastName']).set_axis(players_df['ID']) if not players_df.empty else pd.Series(dtype=str)
+    player = events['PrimaryPlayerID'].map(names).fillna('')
+    assist1 = events['AssistPlayer1ID'].map(names).fillna('')
+    assist2 = events['AssistPlayer2ID'].map(names).fillna('')
+
+    # Goal description with assists and power play or shorthanded indicator
+    assists = np.select(
+        [(assist1 != '') & (assist2 != ''), assist1 != ''],
+        [' (Assists: ' + assist1 + ', ' + assist2 + ')', ' (Assist: ' + assist1 + ')'],
+        default=''
+    )
+    strength = np.select([events['IsPowerPlay'], events['IsShortHanded']], [' (PP)', ' (SH)'], default='')
+    goal = 'Goal: ' + player + assists + strength
+
+    penalty = 'Penalty: ' + player + ', ' + events['PenaltyType'] + ' (' + events['PenaltyDuration'].astype(str) + ' min)'
+
+    event_type = events['EventType']
+    description = np.select(
+        [event_type == 'Goal', event_type == 'Penalty', event_type == 'Shot', event_type == 'Hit', event_type == 'Faceoff'],
+        [goal, penalty, 'Shot: ' + player, 'Hit: ' + player, 'Faceoff won by: ' + player],
+        default=''
+    )
+
+    timeline_df = pd.DataFrame({
+        'GameID': events['GameID'],
+        'Period': events['Period'],
+        'Time': events['Time'],
+        'Event': event_type,
+        'Description': description,
+        'Team': events['Team'],
+        'PrimaryPlayerID': events['PrimaryPlayerID'],
+        'AssistPlayer1ID': events['AssistPlayer1ID'],
+        'AssistPlayer2ID': events['AssistPlayer2ID'],
+        # Sort by period and time
+        'SortTime': pd.to_numeric(events['Time'].str.replace(':', '.'), errors='coerce'),
+    })
+    return timeline_df.sort_values(by=['GameID', 'Period', 'SortTime'], ignore_index=True)
+
+@shared_frame()
+def get_timeline(events_df, players_df):
+    """Cached timeline for every game in the currently loaded season"""
+    return calculate_timeline(events_df, players_df)
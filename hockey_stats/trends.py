@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from hockey_stats.aggregates import get_player_game_stats
+from hockey_stats.dates import calculate_game_index, order_by_date, played_game_ids
+from hockey_stats.normalize import OUR_TEAM_ID
+from hockey_stats.shared import shared_frame
+
+# Rolling windows offered for form charts, in games
+TREND_WINDOWS = [3, 5, 10]
+
+# Most points drawn per series; longer series are thinned before they are sent
+MAX_CHART_POINTS = 120
+
+PLAYER_TREND_COLUMNS = [
+    'PlayerID', 'GameID', 'Date', 'GameNumber', 'Goals', 'Points', '+/-',
+    'RollingPoints', 'RollingGoals', 'CumGoals', 'CumPoints', 'CumPlusMinus'
+]
+
+TEAM_TREND_COLUMNS = [
+    'GameID', 'Date', 'GameNumber', 'GoalsFor', 'GoalsAgainst', 'GoalDiff',
+    'RollingGF', 'RollingGA', 'CumGoalDiff', 'CumPoints'
+]
+
+def calculate_player_trends(player_game_df, games_df, window=5):
+    """Rolling and cumulative scoring for every player across the games they played, in date order
+
+    Rolling columns are per-game averages over the player's last `window`
+    games. Only games the player was marked present for are counted, unless
+    there is no roster at all.
+    """
+    if player_game_df.empty or games_df.empty:
+        return pd.DataFrame(columns=PLAYER_TREND_COLUMNS)
+
+    played = player_game_df[player_game_df['Present']] if player_game_df['Present'].any() else player_game_df
+    game_index_df = calculate_game_index(games_df)
+    trends_df = played.merge(game_index_df[['GameID', 'Date', 'Order']], on='GameID')
+    trends_df = trends_df.sort_values(by=['PlayerID', 'Order'], ignore_index=True)
+
+    by_player = trends_df.groupby('PlayerID', sort=False)
+    trends_df['GameNumber'] = by_player.cumcount() + 1
+    rolling = by_player[['Points', 'Goals']].rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+    trends_df['RollingPoints'] = rolling['Points']
+    trends_df['RollingGoals'] = rolling['Goals']
+    trends_df['CumGoals'] = by_player['Goals'].cumsum()
+    trends_df['CumPoints'] = by_player['Points'].cumsum()
+    trends_df['CumPlusMinus'] = by_player['+/-'].cumsum()
+    return trends_df[PLAYER_TREND_COLUMNS]
+
+def calculate_team_trends(games_df, events_df, window=5):
+    """Rolling goals for and against, cumulative goal differential and standings points, in date order
+
+    Only games with events count; scheduled games are not played 0-0 ties.
+    """
+    games_df = games_df[games_df['GameID'].isin(played_game_ids(games_df, events_df))] if not games_df.empty else games_df
+    if games_df.empty:
+        return pd.DataFrame(columns=TEAM_TREND_COLUMNS)
+
+    trends_df = order_by_date(games_df[['GameID', 'Date', 'GoalsFor', 'GoalsAgainst', 'Result']], calculate_game_index(games_df))
+    trends_df = trends_df.reset_index(drop=True)
+    trends_df['GameNumber'] = np.arange(1, len(trends_df) + 1)
+    trends_df['GoalDiff'] = trends_df['GoalsFor'] - trends_df['GoalsAgainst']
+    trends_df['RollingGF'] = trends_df['GoalsFor'].rolling(window, min_periods=1).mean()
+    trends_df['RollingGA'] = trends_df['GoalsAgainst'].rolling(window, min_periods=1).mean()
+    trends_df['CumGoalDiff'] = trends_df['GoalDiff'].cumsum()
+    trends_df['CumPoints'] = trends_df['Result'].map({'W': 2, 'T': 1}).fillna(0).astype(int).cumsum()
+    return trends_df[TEAM_TREND_COLUMNS]
+
+def downsample(series_df, max_points=MAX_CHART_POINTS):
+    """Evenly spaced rows of a series, always keeping the first and last, when it is longer than `max_points`"""
+    if len(series_df) <= max_points:
+        return series_df
+    positions = np.unique(np.linspace(0, len(series_df) - 1, max_points).round().astype(int))
+    return series_df.iloc[positions]
+
+@shared_frame()
+def get_player_trends(events_df, game_roster_df, games_df, window=5, our_team_id=OUR_TEAM_ID):
+    """Cached player trend series, built from the cached player-game aggregates"""
+    return calculate_player_trends(get_player_game_stats(events_df, game_roster_df, our_team_id), games_df, window)
+
+@shared_frame()
+def get_team_trends(games_df, events_df, window=5):
+    """Cached team trend series"""
+    return calculate_team_trends(games_df, events_df, window)
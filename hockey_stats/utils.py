@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import base64
 from pathlib import Path
 
@@ -60,11 +59,11 @@ def calculate_team_stats(games_df):
             "goals_against": 0
         }
     
-    # Ensure required columns exist
+    # Ensure required columns exist without modifying the caller's frame
     required_cols = ['Result', 'GoalsFor', 'GoalsAgainst']
-    for col in required_cols:
-        if col not in games_df.columns:
-            games_df[col] = 0
+    missing_cols = {col: 0 for col in required_cols if col not in games_df.columns}
+    if missing_cols:
+        games_df = games_df.assign(**missing_cols)
     
     # Calculate stats
     wins = (games_df['Result'] == 'W').sum()
@@ -85,6 +84,9 @@ def calculate_team_stats(games_df):
 
 def get_top_players(stats_df, category, position=None, limit=5):
     """Get top players in a specific category with optional position filter"""
+    # Imported here so the login page can load utils without pandas
+    import pandas as pd
+    
     if stats_df.empty:
         return pd.DataFrame()
     
@@ -100,6 +102,66 @@ def get_top_players(stats_df, category, position=None, limit=5):
     
     return pd.DataFrame()
 
+def payload_size(df):
+    """Approximate bytes sent to the browser for a frame (Arrow-encoded, as st.dataframe does)"""
+    import pyarrow as pa
+    return pa.Table.from_pandas(df, preserve_index=False).nbytes
+
+def format_bytes(size):
+    """Human readable byte count"""
+    if size < 1024:
+        return f"{size} B"
+    return f"{size / 1024:.1f} KB"
+
+def paginate(df, page, page_size):
+    """Rows for a 1-based page number"""
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+def render_paged_dataframe(df, key, column_config, page_size=25):
+    """Display one page of a frame so only the visible window is serialized"""
+    total_rows = len(df)
+    page_count = max(1, -(-total_rows // page_size))
+    
+    page = 1
+    if page_count > 1:
+        page = st.selectbox(
+            "Page",
+            options=range(1, page_count + 1),
+            format_func=lambda p: f"{p} of {page_count}",
+            key=f"{key}_page"
+        )
+    
+    window = paginate(df, page, page_size)
+    st.dataframe(
+        window,
+        column_config=column_config,
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    # Report the window and what it cost to send
+    first_row = (page - 1) * page_size + 1 if total_rows else 0
+    last_row = first_row + len(window) - 1 if total_rows else 0
+    st.caption(f"Rows {first_row}-{last_row} of {total_rows} · {format_bytes(payload_size(window))} sent")
+
+def render_breakdown_table(summary_df, segment_label):
+    """Display goals, shots and penalty minutes for and against per period or game state"""
+    st.dataframe(
+        summary_df[['Segment', 'GF', 'GA', 'Shots', 'ShotsAgainst', 'PIM', 'PIMAgainst']],
+        column_config={
+            'Segment': st.column_config.TextColumn(segment_label),
+            'GF': st.column_config.NumberColumn('GF'),
+            'GA': st.column_config.NumberColumn('GA'),
+            'Shots': st.column_config.NumberColumn('SF'),
+            'ShotsAgainst': st.column_config.NumberColumn('SA'),
+            'PIM': st.column_config.NumberColumn('PIM'),
+            'PIMAgainst': st.column_config.NumberColumn('Opp PIM')
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
 def create_game_card(game):
     """Create HTML for a game card"""
     game_date = game.get('Date', 'Unknown Date')
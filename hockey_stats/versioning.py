@@ -0,0 +1,55 @@
+import hashlib
+import weakref
+
+import pandas as pd
+
+# Fingerprints stamped on frames, by id(); each entry holds a weak reference to
+# its frame and is dropped when the frame is garbage collected
+_stamps = {}
+
+def compute_fingerprint(df):
+    """Row count plus a hash of the frame's columns and values, e.g. '412-9f2c0b7d1e4a5c36'"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update('\x1f'.join(map(str, df.columns)).encode())
+    if len(df):
+        try:
+            hashed = pd.util.hash_pandas_object(df, index=False)
+        except TypeError:
+            # Derived frames can hold tuples or other unhashable cells
+            hashed = pd.util.hash_pandas_object(df.astype(str), index=False)
+        digest.update(hashed.to_numpy().tobytes())
+    return f"{len(df)}-{digest.hexdigest()}"
+
+def stamp_fingerprint(df, fingerprint=None):
+    """Record the frame's fingerprint so later lookups are free
+
+    The stamp belongs to this frame object alone. Frames derived from it,
+    whether filtered, sorted, filled or with a column reassigned, are new
+    objects and get their fingerprint computed, so a stamp is never trusted
+    for contents it was not taken from. Restamp after writing to a stamped
+    frame in place; the row count and columns are checked as a guard.
+    """
+    key = id(df)
+    if key not in _stamps:
+        weakref.finalize(df, _stamps.pop, key, None)
+    _stamps[key] = (weakref.ref(df), len(df), tuple(df.columns), fingerprint or compute_fingerprint(df))
+    return df
+
+def stamped_fingerprint(df):
+    """The fingerprint stamped on this very frame, or None"""
+    stamp = _stamps.get(id(df))
+    if stamp and stamp[0]() is df and stamp[1] == len(df) and stamp[2] == tuple(df.columns):
+        return stamp[3]
+    return None
+
+def frame_fingerprint(df):
+    """The frame's stamped fingerprint, or a freshly computed one if it has none"""
+    return stamped_fingerprint(df) or compute_fingerprint(df)
+
+def data_version(*frames):
+    """Combined version key for a set of frames"""
+    return '/'.join(frame_fingerprint(df) for df in frames)
+
+# Passed to the frame caches so DataFrame arguments are keyed on their fingerprint
+# instead of being hashed value by value on every call
+FRAME_HASH_FUNCS = {pd.DataFrame: frame_fingerprint}
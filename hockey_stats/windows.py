@@ -0,0 +1,53 @@
+import hashlib
+
+from hockey_stats.dates import games_between, last_n_games
+from hockey_stats.shared import shared_frame
+from hockey_stats.versioning import frame_fingerprint, stamp_fingerprint
+
+FULL_SEASON = "Full season"
+
+# Window choices offered above every view; "Last N games" entries are parsed from their label
+WINDOW_OPTIONS = [FULL_SEASON, "Last 5 games", "Last 10 games", "Date range"]
+
+# Windows and date ranges are open-ended, so each cached window function keeps only the most recent ones
+WINDOW_CACHE_ENTRIES = 24
+
+def window_game_ids(game_index_df, window, date_range=None, played_ids=None):
+    """IDs of the games in a window, in date order, or None for the full season
+
+    With `played_ids`, games not yet played are left out, so "Last 5 games"
+    means the last five with events rather than the next ones scheduled.
+    """
+    if window == FULL_SEASON:
+        return None
+    if played_ids is not None:
+        game_index_df = game_index_df[game_index_df['GameID'].isin(played_ids)]
+    if window == "Date range":
+        start, end = date_range if date_range else (None, None)
+        return tuple(games_between(game_index_df, start, end))
+    return tuple(last_n_games(game_index_df, int(window.split()[1])))
+
+def window_key(game_ids):
+    """Short, stable key for a set of games, used in derived fingerprints"""
+    return hashlib.blake2b('\x1f'.join(game_ids).encode(), digest_size=6).hexdigest()
+
+def calculate_window_frame(df, game_ids):
+    """Rows of a game-keyed frame for the games in a window
+
+    The result is stamped with the source fingerprint plus the window, so
+    every cached table built from it is keyed on the window without hashing
+    the rows again.
+    """
+    window_df = df[df['GameID'].isin(game_ids)] if not df.empty else df.copy()
+    return stamp_fingerprint(window_df, f"{frame_fingerprint(df)}@{window_key(game_ids)}")
+
+@shared_frame(max_entries=WINDOW_CACHE_ENTRIES)
+def get_window_frame(df, game_ids):
+    """Cached rows of a game-keyed frame for a window, shared by every session viewing it"""
+    return calculate_window_frame(df, game_ids)
+
+def apply_window(game_ids, *frames):
+    """The game-keyed frames restricted to a window, or unchanged for the full season"""
+    if game_ids is None:
+        return frames
+    return tuple(get_window_frame(df, tuple(game_ids)) for df in frames)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Load test the dashboard with concurrent simulated sessions.
+Starts `streamlit run app.py` on synthetic offline data and drives it over the
+same websocket protocol the browser uses. Each session logs in, then keeps
+switching views and changing selectboxes with a random think time in between.
+Reports rerun latency percentiles, server CPU and memory for each session count.
+
+Usage: python load_test.py [--sessions 1 5 10 20] [--duration 30] [--think 1.0]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+from hockey_stats.offline import generate_records, save_records
+from hockey_stats.sheets_service import OFFLINE_RECORDS_ENV
+
+ROOT = Path(__file__).parent
+
+NAV_OPTIONS = ["My Player's Stats", "Team Stats & Leaderboards", "Game Stats", "Compare Players"]
+
+WIDGET_TYPES = {'button', 'selectbox', 'text_input'}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def process_usage(pid):
+    """CPU seconds, current RSS and peak RSS in MB of a process, read from /proc (Linux only)"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    with open(f"/proc/{pid}/status") as f:
+        status = dict(line.split(':', 1) for line in f if ':' in line)
+    return cpu, int(status['VmRSS'].split()[0]) / 1024, int(status['VmHWM'].split()[0]) / 1024
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def start_server(workdir, records_path, password, port):
+    """Run the app headless with offline data and a secrets file holding the load-test password"""
+    home = Path(workdir) / "home"
+    (home / ".streamlit").mkdir(parents=True)
+    password_hash = hashlib.sha256(password.encode()).hexdigest()
+    (home / ".streamlit" / "secrets.toml").write_text(f'TEAM_PASSWORD_HASH = "{password_hash}"\n')
+
+    env = dict(os.environ, HOME=str(home), **{OFFLINE_RECORDS_ENV: str(records_path)})
+    log = open(Path(workdir) / "server.log", "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless=true", f"--server.port={port}",
+         "--browser.gatherUsageStats=false", "--server.fileWatcherType=none"],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.read() == b"ok":
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"Server did not start; see {log.name}")
+
+class Session:
+    """One simulated browser tab"""
+
+    def __init__(self, url, password, think, seed):
+        self.url = url
+        self.password = password
+        self.think = think
+        self.rng = random.Random(seed)
+        self.widgets = {}   # widget id -> (type, proto) from the last run
+        self.states = {}    # widget id -> WidgetState sent with every rerun
+        self.cache = {}     # messages the server may later send by reference
+        self.latencies = []
+        self.errors = 0
+
+    async def rerun(self, trigger_id=None):
+        """Send a rerun with the current widget states and wait for the script to finish"""
+        msg = BackMsg()
+        widget_states = msg.rerun_script.widget_states.widgets
+        widget_states.extend(state for widget_id, state in self.states.items() if widget_id in self.widgets or not self.widgets)
+        if trigger_id:
+            widget_states.add(id=trigger_id, trigger_value=True)
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        self.widgets = {}
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("Server closed the connection")
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof('type')
+            if kind == 'ref_hash':
+                forward = self.cache[forward.ref_hash]
+                kind = forward.WhichOneof('type')
+            elif forward.metadata.cacheable:
+                self.cache[forward.hash] = forward
+
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception':
+                    self.errors += 1
+                elif element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.id] = (element_type, widget)
+            elif kind == 'script_finished':
+                # Navigation calls st.rerun(); the user waits for the run that follows
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+        self.latencies.append(time.perf_counter() - start)
+
+    def find(self, element_type, label=None):
+        return [(widget_id, widget) for widget_id, (kind, widget) in self.widgets.items()
+                if kind == element_type and (label is None or widget.label == label)]
+
+    async def log_in(self):
+        await self.rerun()
+        password_inputs = self.find('text_input', "Team Password")
+        if password_inputs:
+            widget_id, _ = password_inputs[0]
+            self.states[widget_id] = WidgetState(id=widget_id, string_value=self.password)
+            await self.rerun()
+        return bool(self.find('button', NAV_OPTIONS[0]))
+
+    async def act(self):
+        """Switch view, or pick a different value in one of the view's selectboxes"""
+        selectboxes = [(widget_id, widget) for widget_id, widget in self.find('selectbox') if len(widget.options) > 1]
+        if not selectboxes or self.rng.random() < 0.3:
+            widget_id, _ = self.rng.choice(self.find('button', self.rng.choice(NAV_OPTIONS)))
+            await self.rerun(trigger_id=widget_id)
+            return
+        widget_id, widget = self.rng.choice(selectboxes)
+        current = self.states[widget_id].int_value if widget_id in self.states else widget.default
+        choices = [i for i in range(len(widget.options)) if i != current]
+        self.states[widget_id] = WidgetState(id=widget_id, int_value=self.rng.choice(choices))
+        await self.rerun()
+
+    async def run(self, until):
+        self.ws = await websocket_connect(self.url, max_message_size=256 * 1024 * 1024)
+        try:
+            if not await self.log_in():
+                self.errors += 1
+                return
+            while time.monotonic() < until:
+                await asyncio.sleep(self.rng.expovariate(1 / self.think) if self.think else 0)
+                await self.act()
+        finally:
+            self.ws.close()
+
+async def run_stage(url, password, sessions, duration, think, seed):
+    until = time.monotonic() + duration
+    clients = [Session(url, password, think, seed + i) for i in range(sessions)]
+    results = await asyncio.gather(*(client.run(until) for client in clients), return_exceptions=True)
+    failures = sum(isinstance(result, Exception) for result in results)
+    return [latency for client in clients for latency in client.latencies], sum(c.errors for c in clients) + failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20], help="Session counts to run, in order")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per session count")
+    parser.add_argument("--think", type=float, default=1.0, help="Mean seconds between actions")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--players", type=int, default=40)
+    parser.add_argument("--password", default="load-test", help="Must match TEAM_PASSWORD_HASH if the project has its own secrets.toml")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        records_path = Path(workdir) / "records.json"
+        save_records(generate_records(n_players=args.players, n_games=args.games, seed=args.seed), records_path)
+        port = free_port()
+        server = start_server(workdir, records_path, args.password, port)
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        try:
+            # One session first so the data caches are warm before measuring
+            asyncio.run(run_stage(url, args.password, 1, 0, 0, args.seed))
+            _, idle_rss, _ = process_usage(server.pid)
+            print(f"Server RSS after warm-up: {idle_rss:.0f} MB\n")
+            print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+                  f"{'errors':>6} {'CPU/rerun ms':>12} {'CPU %':>6} {'RSS MB':>7} {'MB/session':>10}")
+            for sessions in args.sessions:
+                cpu_start, _, _ = process_usage(server.pid)
+                wall_start = time.perf_counter()
+                latencies, errors = asyncio.run(run_stage(url, args.password, sessions, args.duration, args.think, args.seed))
+                wall = time.perf_counter() - wall_start
+                cpu_end, rss, _ = process_usage(server.pid)
+                cpu = cpu_end - cpu_start
+                if not latencies:
+                    print(f"{sessions:>8} no reruns completed, errors: {errors}")
+                    continue
+                ms = [latency * 1000 for latency in latencies]
+                print(f"{sessions:>8} {len(ms):>7} {percentile(ms, 50):>8.0f} {percentile(ms, 95):>8.0f} "
+                      f"{percentile(ms, 99):>8.0f} {max(ms):>8.0f} {errors:>6} {cpu / len(ms) * 1000:>12.1f} "
+                      f"{cpu / wall * 100:>6.0f} {rss:>7.0f} {(rss - idle_rss) / sessions:>10.1f}")
+            _, _, peak_rss = process_usage(server.pid)
+            print(f"\nServer peak RSS: {peak_rss:.0f} MB")
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
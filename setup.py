@@ -9,6 +9,7 @@ setup(
         "gspread>=6.0.2",
         "pandas>=2.1.0",
         "numpy>=1.26.0",
+        "pyarrow>=7.0",
         "google-auth>=2.27.0",
     ],
     python_requires=">=3.9",